@@ -0,0 +1,127 @@
+import argparse
+import sys
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# ============================================================
+# Project paths
+# ============================================================
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from cycle_tda.rolling import rolling_ph  # noqa: E402
+
+DATA_DIR = PROJECT_ROOT / "data" / "raw"
+OUT_PATH = PROJECT_ROOT / "reports" / "benchmarks" / "approx_ph.csv"
+
+# ============================================================
+# Benchmark grid
+# ============================================================
+SERIES = {
+    "Gold (XAU)": "XAU_Monthly.csv",
+    "US CPI": "CPI_Monthly.csv",
+    "Fed Funds": "FEDFUNDS_Monthly.csv",
+}
+
+WINDOWS = [60, 120, 213]
+M, TAU = 3, 2
+
+APPROX_SETTINGS = [
+    {"n_perm": 40},
+    {"n_perm": 25},
+    {"thresh": 1.5},
+    {"n_perm": 40, "thresh": 1.5},
+]
+
+
+def load_or_synthetic(name: str, filename: str, n_synth: int) -> pd.Series:
+    """
+    Real log series if available, otherwise a century-long synthetic proxy
+    (random walk + 8.6y cycle) of the same monthly shape.
+    """
+    path = DATA_DIR / filename
+    if path.exists():
+        df = pd.read_csv(path)
+        s = df.set_index(pd.to_datetime(df.iloc[:, 0]))[df.columns[-1]].dropna()
+        return np.log(s) if (s > 0).all() else s
+
+    print(f"  {filename} not found — using synthetic series for {name}")
+    rng = np.random.default_rng(zlib.crc32(name.encode()))
+    t = np.arange(n_synth)
+    y = np.cumsum(rng.normal(scale=0.03, size=n_synth)) + 0.2 * np.sin(2 * np.pi * t / 103)
+    idx = pd.date_range("1875-01-31", periods=n_synth, freq="ME")
+    return pd.Series(y, index=idx)
+
+
+def timed_rolling(series, window, **kwargs):
+    t0 = time.perf_counter()
+    df = rolling_ph(series, window, 1, M, TAU, **kwargs)
+    return df, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Approximate vs exact rolling PH")
+    parser.add_argument("--n-synth", type=int, default=1800, help="synthetic length")
+    parser.add_argument("--out", type=Path, default=OUT_PATH)
+    args = parser.parse_args()
+
+    rows = []
+    for name, filename in SERIES.items():
+        series = load_or_synthetic(name, filename, args.n_synth)
+        print(f"\n=== {name} ({len(series)} obs) ===")
+
+        for window in WINDOWS:
+            if len(series) < window + 10:
+                continue
+
+            exact, t_exact = timed_rolling(series, window)
+            print(f"  window={window}: exact {t_exact:.2f}s ({len(exact)} windows)")
+
+            for setting in APPROX_SETTINGS:
+                approx, t_approx = timed_rolling(series, window, **setting)
+                err_z1 = (approx["z1"] - exact["z1"]).abs()
+                err_max = (approx["max_h1"] - exact["max_h1"]).abs()
+
+                row = {
+                    "series": name,
+                    "n_obs": len(series),
+                    "window": window,
+                    "n_windows": len(exact),
+                    "n_perm": setting.get("n_perm"),
+                    "thresh": setting.get("thresh", np.inf),
+                    "t_exact_s": t_exact,
+                    "t_approx_s": t_approx,
+                    "speedup": t_exact / t_approx,
+                    "z1_mae": err_z1.mean(),
+                    "z1_max_err": err_z1.max(),
+                    "z1_corr": approx["z1"].corr(exact["z1"]),
+                    "max_h1_mae": err_max.mean(),
+                    "max_h1_max_err": err_max.max(),
+                    "max_h1_corr": approx["max_h1"].corr(exact["max_h1"]),
+                    "mean_bound": approx["approx_bound"].mean(),
+                    # persistence moves by at most twice the bottleneck distance
+                    "bound_holds": (
+                        bool((err_max <= 2 * approx["approx_bound"] + 1e-9).all())
+                        if "thresh" not in setting
+                        else None
+                    ),
+                }
+                rows.append(row)
+                print(
+                    f"    {setting}: {row['speedup']:.1f}x | "
+                    f"z1 MAE {row['z1_mae']:.4f} (corr {row['z1_corr']:.3f}) | "
+                    f"max_h1 MAE {row['max_h1_mae']:.4f} | bound {row['mean_bound']:.3f}"
+                )
+
+    out = pd.DataFrame(rows)
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    out.to_csv(args.out, index=False)
+    print(f"\n✓ Saved → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# ============================================================
+# Project paths
+# ============================================================
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from cycle_tda.coherence import coherence_index  # noqa: E402
+from cycle_tda.embeddings import delay_embedding  # noqa: E402
+from cycle_tda.ph import compute_diagrams  # noqa: E402
+from cycle_tda.rolling import rolling_ph  # noqa: E402
+from cycle_tda.selection import (  # noqa: E402
+    ami_tau,
+    fnn_percent,
+    rolling_embedding_params,
+    select_embedding_params,
+)
+from cycle_tda.validation import bootstrap_lagged_correlations  # noqa: E402
+
+OUT_PATH = PROJECT_ROOT / "reports" / "benchmarks" / "suite.json"
+
+# ============================================================
+# Synthetic inputs
+# ============================================================
+N_MONTHLY = 1800  # 150 years
+N_DAILY = 40 * 252  # 40 trading years
+DAILY_STRIDE = 21  # one window per trading month
+WINDOWS = [60, 120, 213]  # 5y, 10y, Dewey 17.75y
+M, TAU = 3, 2
+
+
+def synthetic_series(n: int, period: float, seed: int, freq: str) -> pd.Series:
+    """
+    Random walk + one cycle, indexed like the real data.
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(n)
+    y = np.cumsum(rng.normal(scale=0.03, size=n)) + 0.2 * np.sin(2 * np.pi * t / period)
+    start = "1875-01-31" if freq == "ME" else "1985-01-01"
+    return pd.Series(y, index=pd.date_range(start, periods=n, freq=freq))
+
+
+def synthetic_z1_panel(n: int, k: int, seed: int) -> tuple[pd.DataFrame, pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    Z = pd.DataFrame(
+        np.abs(rng.normal(size=(n, k))).cumsum(axis=0) % 3,
+        index=pd.date_range("1875-01-31", periods=n, freq="ME"),
+        columns=[f"S{j}" for j in range(k)],
+    )
+    ZN = pd.DataFrame(0.5 + 0.1 * rng.random((n, k)), index=Z.index, columns=Z.columns)
+    return Z, ZN
+
+
+# ============================================================
+# Cases: name -> (callable, work units per call, unit)
+# ============================================================
+def build_cases(quick: bool) -> dict:
+    n_monthly = 600 if quick else N_MONTHLY
+    n_daily = 10 * 252 if quick else N_DAILY
+
+    monthly = synthetic_series(n_monthly, 103, seed=1, freq="ME")
+    daily = synthetic_series(n_daily, 8.6 * 252, seed=2, freq="B")
+    y_m = monthly.values
+    y_d = daily.values
+
+    cases = {}
+
+    n_pts = len(y_m) - (M - 1) * TAU
+    cases["delay_embedding/monthly"] = (lambda: delay_embedding(y_m, M, TAU), n_pts, "points")
+
+    for w in WINDOWS:
+        X = delay_embedding(y_m[:w], M, TAU)
+        X = (X - X.mean(axis=0)) / X.std(axis=0)
+        cases[f"compute_diagrams/w{w}"] = (lambda X=X: compute_diagrams(X, maxdim=1), 1, "diagrams")
+
+    for w in WINDOWS:
+        n_win = len(y_m) - w + 1
+        cases[f"rolling_ph/monthly/w{w}"] = (
+            lambda w=w: rolling_ph(monthly, w, 1, M, TAU), n_win, "windows"
+        )
+
+    w = WINDOWS[-1]
+    n_win = (len(y_d) - w) // DAILY_STRIDE + 1
+    cases[f"rolling_ph/daily/w{w}"] = (
+        lambda: rolling_ph(daily, w, DAILY_STRIDE, M, TAU), n_win, "windows"
+    )
+
+    for label, y in (("monthly", y_m), ("daily", y_d)):
+        cases[f"ami_tau/{label}"] = (lambda y=y: ami_tau(y, max_tau=60), 1, "series")
+        cases[f"fnn_percent/{label}"] = (lambda y=y: fnn_percent(y, tau=TAU, m_max=12), 1, "series")
+        cases[f"select_embedding_params/{label}"] = (
+            lambda y=y: select_embedding_params(y, tau_cap=6, memo=False), 1, "series"
+        )
+
+    n_win = len(y_m) - WINDOWS[1] + 1
+    cases[f"rolling_embedding_params/monthly/w{WINDOWS[1]}"] = (
+        lambda: rolling_embedding_params(monthly, WINDOWS[1], tau_cap=6), n_win, "windows"
+    )
+
+    for k in (6, 50):
+        Z, ZN = synthetic_z1_panel(n_monthly, k, seed=k)
+        cases[f"coherence_index/k{k}"] = (lambda Z=Z, ZN=ZN: coherence_index(Z, ZN), len(Z), "rows")
+
+    dd = pd.Series(np.minimum(0.0, y_m - np.maximum.accumulate(y_m)), index=monthly.index)
+    cases["bootstrap_lagged_correlations/n200"] = (
+        lambda: bootstrap_lagged_correlations(monthly, dd, n_boot=200), 200, "draws"
+    )
+
+    return cases
+
+
+# ============================================================
+# Measurement
+# ============================================================
+def measure(fn, units: int, repeat: int, min_time: float) -> dict:
+    """
+    Best-of-`repeat` wall time (each sample loops until min_time) and
+    tracemalloc peak of one extra call.
+    """
+    fn()  # warm-up (imports, caches, allocator)
+
+    best = np.inf
+    for _ in range(repeat):
+        n_calls = 0
+        t0 = time.perf_counter()
+        while True:
+            fn()
+            n_calls += 1
+            elapsed = time.perf_counter() - t0
+            if elapsed >= min_time:
+                break
+        best = min(best, elapsed / n_calls)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "seconds": best,
+        "throughput": units / best,
+        "peak_mb": peak / 1024**2,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Print throughput / memory ratios vs baseline; return regressed cases.
+    """
+    regressed = []
+    print(f"\n{'case':<40} {'speed':>8} {'memory':>8}")
+    for name, cur in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<40} {'new':>8}")
+            continue
+
+        speed = cur["throughput"] / base["throughput"]
+        mem = cur["peak_mb"] / base["peak_mb"] if base["peak_mb"] > 0 else np.nan
+        flag = ""
+        if speed < 1 / tolerance or mem > tolerance:
+            flag = "  <-- regression"
+            regressed.append(name)
+        print(f"{name:<40} {speed:>7.2f}x {mem:>7.2f}x{flag}")
+
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PH pipeline hot-path benchmarks")
+    parser.add_argument("--out", type=Path, default=OUT_PATH)
+    parser.add_argument("--baseline", type=Path, help="results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="allowed slowdown / memory ratio")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timing sample")
+    parser.add_argument("--filter", default="", help="only cases containing this string")
+    parser.add_argument("--quick", action="store_true", help="shorter synthetic series")
+    args = parser.parse_args()
+
+    cases = {k: v for k, v in build_cases(args.quick).items() if args.filter in k}
+
+    results = {}
+    for name, (fn, units, unit) in cases.items():
+        r = measure(fn, units, args.repeat, args.min_time)
+        results[name] = {**r, "units": units, "unit": unit}
+        print(
+            f"{name:<40} {r['seconds'] * 1e3:>10.2f} ms  "
+            f"{r['throughput']:>12.1f} {unit}/s  peak {r['peak_mb']:>8.1f} MB"
+        )
+
+    out = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(out, indent=2))
+    print(f"\n✓ Saved → {args.out}")
+
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline["meta"].get("quick") != args.quick:
+            print("⚠️ baseline was run with a different --quick setting")
+        regressed = compare(results, baseline["results"], args.tolerance)
+        if regressed:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
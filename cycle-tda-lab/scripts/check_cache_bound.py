@@ -0,0 +1,71 @@
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# ============================================================
+# Project paths
+# ============================================================
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from cycle_tda.cache import DiskCache  # noqa: E402
+from cycle_tda.rolling import rolling_ph  # noqa: E402
+
+# ============================================================
+# Setup
+# ============================================================
+N = 400
+WINDOW, STRIDE, M, TAU = 60, 1, 3, 2
+MAX_BYTES = 300_000
+
+
+def fresh_series(seed: int) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    y = np.cumsum(rng.normal(size=N))
+    return pd.Series(y, index=pd.date_range("1950-01-31", periods=N, freq="ME"))
+
+
+# ============================================================
+# Check
+# ============================================================
+def main():
+    parser = argparse.ArgumentParser(description="DiskCache size bound under a process pool")
+    parser.add_argument("--runs", type=int, default=6)
+    parser.add_argument("--n-jobs", type=int, default=4)
+    parser.add_argument("--max-bytes", type=int, default=MAX_BYTES)
+    args = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = DiskCache(tmp, max_bytes=args.max_bytes)
+        for run in range(args.runs):
+            rolling_ph(
+                fresh_series(run),
+                WINDOW,
+                STRIDE,
+                M,
+                TAU,
+                executor="process",
+                n_jobs=args.n_jobs,
+                cache=cache,
+            )
+            stats = cache.stats()
+            flag = "" if stats["size_bytes"] <= args.max_bytes else "  ⚠️"
+            print(
+                f"run {run}: size {stats['size_bytes']:>9,} / {args.max_bytes:,} bytes, "
+                f"writes {stats['writes']}, evictions {stats['evictions']}{flag}"
+            )
+            failed |= bool(flag)
+
+    if failed:
+        print("\n⚠️ cache exceeded max_bytes")
+        sys.exit(1)
+    print("\n✓ cache stayed within max_bytes")
+
+
+if __name__ == "__main__":
+    main()
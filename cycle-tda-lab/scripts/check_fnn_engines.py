@@ -0,0 +1,76 @@
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# ============================================================
+# Project paths
+# ============================================================
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from cycle_tda.selection import fnn_scan  # noqa: E402
+
+# ============================================================
+# Synthetic inputs
+# ============================================================
+# lengths around the dense / KD-tree switch (~1448 points at the default budget)
+LENGTHS = [300, 1440, 1460]
+TAUS = [1, 2, 6]
+M_MAX = 8
+
+
+def quantized_rates(n: int, seed: int, step: float = 0.25) -> np.ndarray:
+    """
+    Policy-rate-like path: 25bp steps, long flat stretches, many
+    repeated delay vectors and equidistant neighbours.
+    """
+    rng = np.random.default_rng(seed)
+    moves = rng.choice([-1, 0, 0, 0, 0, 0, 1], size=n)
+    return np.round(np.clip(5.0 + step * np.cumsum(moves), 0.0, None) / step) * step
+
+
+def integer_walk(n: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return np.cumsum(rng.integers(-2, 3, size=n)).astype(float)
+
+
+# ============================================================
+# Check
+# ============================================================
+def compare(y: np.ndarray) -> float:
+    """
+    Largest |dense - tree| FNN % over TAUS x m=1..M_MAX.
+    """
+    dense = fnn_scan(y, TAUS, m_max=M_MAX, max_dense_bytes=np.iinfo(np.int64).max)
+    tree = fnn_scan(y, TAUS, m_max=M_MAX, max_dense_bytes=0)
+    if not np.array_equal(np.isnan(dense), np.isnan(tree)):
+        return np.inf
+    return float(np.nanmax(np.abs(dense - tree)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FNN dense vs KD-tree agreement on tied data")
+    parser.add_argument("--seeds", type=int, default=5)
+    parser.add_argument("--tolerance", type=float, default=1e-9, help="allowed FNN % difference")
+    args = parser.parse_args()
+
+    failed = []
+    for n in LENGTHS:
+        for seed in range(args.seeds):
+            for name, y in (("rates", quantized_rates(n, seed)), ("int_walk", integer_walk(n, seed))):
+                diff = compare(y)
+                flag = "" if diff <= args.tolerance else "  ⚠️"
+                print(f"{name:<10} n={n:<5} seed={seed}  max |dense - tree| = {diff:.3g}{flag}")
+                if flag:
+                    failed.append((name, n, seed))
+
+    if failed:
+        print(f"\n⚠️ {len(failed)} series disagree")
+        sys.exit(1)
+    print("\n✓ dense and KD-tree FNN agree")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import sys
 import pandas as pd
 from pathlib import Path
 
@@ -7,6 +8,10 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = PROJECT_ROOT / "data" / "raw"
 DATA_DIR.mkdir(parents=True, exist_ok=True)
+HTTP_CACHE_DIR = DATA_DIR / ".http_cache"
+
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+from cycle_tda.download import Downloader, read_csv_bytes  # noqa: E402
 
 print("Writing FRED data to:", DATA_DIR.resolve())
 
@@ -44,9 +49,8 @@ FRED_SERIES = {
     "INDPRO_Monthly.csv": {"id": "INDPRO", "col": "indpro"},
 }
 
-def fetch_fred(series_id: str) -> pd.DataFrame:
-    url = f"https://fred.stlouisfed.org/graph/fredgraph.csv?id={series_id}"
-    return pd.read_csv(url)
+def fred_url(series_id: str) -> str:
+    return f"https://fred.stlouisfed.org/graph/fredgraph.csv?id={series_id}"
 
 def clean_to_monthly(df: pd.DataFrame, col: str) -> pd.DataFrame:
     df.columns = ["date", col]
@@ -56,27 +60,40 @@ def clean_to_monthly(df: pd.DataFrame, col: str) -> pd.DataFrame:
     df = (
         df.dropna()
           .set_index("date")
-          .resample("M")
+          .resample("ME")
           .last()
           .dropna()
           .reset_index()
     )
     return df
 
-def main():
-    for fname, cfg in FRED_SERIES.items():
-        print(f"Downloading {fname} ({cfg['id']})...")
-        raw = fetch_fred(cfg["id"])
-        out_df = clean_to_monthly(raw, cfg["col"])
-
-        out_path = DATA_DIR / fname
-        out_df.to_csv(out_path, index=False)
-
-        print(
-            f"Saved → {fname} | {out_df['date'].min().date()} → {out_df['date'].max().date()} | {len(out_df)} rows"
-        )
-        print("-" * 72)
+def report(row: dict):
+    if row["status"] == "failed":
+        print(f"✗ {row['name']}: {row['error']}")
+        return
+    print(
+        f"{row['status']:<12} → {row['name']} | {row['start'].date()} → {row['end'].date()} | "
+        f"{row['rows']} rows (+{row['new_rows']}) | {row['seconds']:.1f}s"
+    )
 
+def main():
+    jobs = {
+        fname: {
+            "url": fred_url(cfg["id"]),
+            "clean": lambda body, col=cfg["col"]: clean_to_monthly(read_csv_bytes(body), col),
+            "path": DATA_DIR / fname,
+        }
+        for fname, cfg in FRED_SERIES.items()
+    }
+
+    print(f"Refreshing {len(jobs)} FRED series...")
+    log = Downloader(HTTP_CACHE_DIR).run(jobs, on_event=report)
+    print("-" * 72)
+
+    failed = log[log["status"] == "failed"]
+    if len(failed):
+        print(f"⚠️ {len(failed)} series failed: {', '.join(failed['name'])}")
+        sys.exit(1)
     print("✓ All FRED series downloaded")
 
 if __name__ == "__main__":
@@ -1,12 +1,17 @@
+import sys
 import pandas as pd
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+from cycle_tda.download import Downloader, read_csv_bytes  # noqa: E402
+
 # ===============================
 # Configuration
 # ===============================
 
 DATA_DIR = Path("data/raw")
 DATA_DIR.mkdir(parents=True, exist_ok=True)
+HTTP_CACHE_DIR = DATA_DIR / ".http_cache"
 
 STOOQ_ASSETS = {
     "XAU_Monthly.csv": {
@@ -23,10 +28,8 @@ STOOQ_ASSETS = {
 # Download + Clean
 # ===============================
 
-def download_and_clean(name, cfg):
-    print(f"Downloading {name}...")
-
-    df = pd.read_csv(cfg["url"])
+def clean(body, cfg):
+    df = read_csv_bytes(body)
     df.columns = [c.capitalize() for c in df.columns]
 
     # Parse date
@@ -38,20 +41,37 @@ def download_and_clean(name, cfg):
     )
 
     # Sort and drop invalid rows
-    df = df.dropna(subset=["Date", "Close"]).sort_values("Date")
+    return df.dropna(subset=["Date", "Close"]).sort_values("Date")
 
-    out_path = DATA_DIR / name
-    df.to_csv(out_path, index=False)
 
-    print(f"Saved → {out_path}")
-    print(f"Rows: {len(df)} | Date range: {df['Date'].min().date()} → {df['Date'].max().date()}")
+def report(row):
+    if row["status"] == "failed":
+        print(f"✗ {row['name']}: {row['error']}")
+        return
+    print(f"{row['status']} → {DATA_DIR / row['name']}")
+    print(
+        f"Rows: {row['rows']} (+{row['new_rows']}) | "
+        f"Date range: {row['start'].date()} → {row['end'].date()}"
+    )
     print("-" * 50)
 
 
 def main():
-    for name, cfg in STOOQ_ASSETS.items():
-        download_and_clean(name, cfg)
-
+    jobs = {
+        name: {
+            "url": cfg["url"],
+            "clean": lambda body, cfg=cfg: clean(body, cfg),
+            "path": DATA_DIR / name,
+            "date_col": "Date",
+        }
+        for name, cfg in STOOQ_ASSETS.items()
+    }
+
+    print(f"Downloading {len(jobs)} STOOQ series...")
+    log = Downloader(HTTP_CACHE_DIR).run(jobs, on_event=report)
+
+    if (log["status"] == "failed").any():
+        sys.exit(1)
     print("All STOOQ CSVs downloaded successfully.")
 
 
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 def extract_cyclic_episodes(
@@ -28,3 +29,91 @@ def extract_cyclic_episodes(
 
     episodes["duration_years"] = episodes["duration_months"] / 12
     return episodes
+
+
+def run_bounds(
+    mask: np.ndarray,
+    groups: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    First and last positions of each run of True in mask; with groups
+    (one integer code per row, rows of a group contiguous), runs do not
+    cross group boundaries.
+    """
+    mask = np.asarray(mask, dtype=bool)
+    brk = np.ones(len(mask) + 1, dtype=bool)
+    if groups is not None:
+        brk[1:-1] = groups[1:] != groups[:-1]
+    else:
+        brk[1:-1] = False
+
+    prev = np.concatenate([[False], mask[:-1]]) & ~brk[:-1]
+    nxt = np.concatenate([mask[1:], [False]]) & ~brk[1:]
+    return np.flatnonzero(mask & ~prev), np.flatnonzero(mask & ~nxt)
+
+
+def extract_cyclic_episodes_rle(
+    df: pd.DataFrame,
+    regime_col: str = "cyclic_regime",
+    strength_col: str = "cycle_strength",
+    by: str | list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    extract_cyclic_episodes via run-length encoding, without a Python
+    call per episode.
+
+    Without `by` the output is identical to extract_cyclic_episodes. With
+    `by` (e.g. ["asset", "cycle"]) a long frame of many series is handled
+    in one pass: runs are found per group and the group keys are added
+    as columns (episode_id then numbers runs of the whole frame).
+    """
+    by = [by] if isinstance(by, str) else list(by or [])
+
+    work = df.sort_index(kind="stable")
+    if by:
+        work = work.sort_values(by, kind="stable")
+
+    regime = work[regime_col]
+    groups = None
+    new_run = regime.ne(regime.shift()).to_numpy()
+    if by:
+        keys = work[by]
+        changed = keys.ne(keys.shift()).any(axis=1).to_numpy()
+        groups = np.cumsum(changed)
+        new_run = new_run | changed
+
+    cyclic = (regime == "Cyclic").to_numpy()
+    starts, ends = run_bounds(cyclic, groups)
+    episode_id = np.cumsum(new_run)[starts]
+
+    # reduceat spans start to next start; rows between runs are masked out
+    x = work[strength_col].to_numpy(dtype=float)
+    ok = cyclic & ~np.isnan(x)
+    if len(starts):
+        count = np.add.reduceat(ok.astype(np.int64), starts)
+        total = np.add.reduceat(np.where(ok, x, 0.0), starts)
+        peak = np.fmax.reduceat(np.where(cyclic, x, np.nan), starts)
+    else:
+        count, total, peak = np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(count > 0, total / np.maximum(count, 1), np.nan)
+
+    index = work.index
+    episodes = pd.DataFrame(
+        {
+            "start_date": index[starts],
+            "end_date": index[ends],
+            "duration_months": count,
+            "mean_strength": mean,
+            "max_strength": peak,
+        },
+        index=pd.Index(episode_id, name="episode_id"),
+    )
+    if by:
+        for col in by:
+            episodes.insert(0, col, work[col].to_numpy()[starts])
+
+    episodes = episodes.sort_values("duration_months", ascending=False)
+    episodes["duration_years"] = episodes["duration_months"] / 12
+    return episodes
@@ -1,7 +1,14 @@
 import pandas as pd
 
+from ..cycle_tda.parallel import run_tasks
 from ..cycle_tda.rolling import rolling_ph
 from ..cycle_tda.transforms import log_price, log_returns
+from .catalog import CYCLE_CATALOG
+
+REPRESENTATIONS = {
+    "log_price": log_price,
+    "log_returns": log_returns,
+}
 
 
 def run_cycle_ph_experiment(
@@ -45,3 +52,61 @@ def run_cycle_ph_experiment(
         results.append(df_roll)
 
     return pd.concat(results, ignore_index=True)
+
+
+def run_cycle_catalog_sweep(
+    series: pd.Series,
+    m: int,
+    tau: int,
+    catalog: dict = CYCLE_CATALOG,
+    representations: tuple[str, ...] = ("log_price", "log_returns"),
+    executor: str = "serial",
+    n_jobs: int | None = None,
+    **ph_kwargs,
+):
+    """
+    run_cycle_ph_experiment for every cycle in a catalog.
+
+    Cycles sharing a window length (e.g. Armstrong_8.6y and Pi_3141d) are
+    computed once per representation, in parallel, and the result is
+    copied out to each cycle with its metadata. Output rows are in catalog
+    order, then representation order, as if each cycle had been run alone.
+    """
+    reps = {name: REPRESENTATIONS[name](series).dropna() for name in representations}
+
+    # unique (window, representation) jobs, first-seen order
+    jobs = list(dict.fromkeys(
+        (meta["months"], rep_name)
+        for meta in catalog.values()
+        for rep_name in representations
+    ))
+
+    # longest windows first; results come back in task order regardless
+    jobs.sort(key=lambda job: -job[0])
+    tasks = [(reps[rep_name], window, m, tau, ph_kwargs) for window, rep_name in jobs]
+    frames = dict(zip(jobs, run_tasks(_sweep_job, tasks, executor=executor, n_jobs=n_jobs)))
+
+    results = []
+    for cycle_id, meta in catalog.items():
+        for rep_name in representations:
+            df_roll = frames[(meta["months"], rep_name)].copy()
+            df_roll["representation"] = rep_name
+            df_roll["cycle_id"] = cycle_id
+            df_roll["cycle_years"] = meta["years"]
+            df_roll["cycle_months"] = meta["months"]
+            df_roll["cycle_family"] = meta["family"]
+
+            results.append(df_roll)
+
+    return pd.concat(results, ignore_index=True)
+
+
+def _sweep_job(rep_series, window, m, tau, ph_kwargs):
+    df_roll = rolling_ph(
+        series=rep_series,
+        window=window,
+        m=m,
+        tau=tau,
+        **ph_kwargs,
+    )
+    return df_roll.reset_index()
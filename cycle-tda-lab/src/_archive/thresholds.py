@@ -1,17 +1,164 @@
 import numpy as np
 import pandas as pd
 
+THRESHOLD_MODES = ("full", "expanding", "rolling")
+
+
 def apply_cyclic_threshold(
     df: pd.DataFrame,
     strength_col: str = "cycle_strength",
     q: float = 0.95,
-) -> tuple[pd.DataFrame, float]:
+    mode: str = "full",
+    window: int | None = None,
+    min_periods: int = 12,
+) -> tuple[pd.DataFrame, float | pd.Series]:
     """
     Adds `cyclic_regime` column based on quantile threshold.
+
+    mode="full" uses the full-sample quantile (look-ahead). "expanding"
+    and "rolling" use only observations up to each date (see
+    causal_threshold); the threshold series is returned and also stored
+    as `cyclic_threshold`. Rows without a threshold yet are Non-Cyclic.
     """
     out = df.copy()
-    thresh = out[strength_col].quantile(q)
+    if mode == "full":
+        thresh = out[strength_col].quantile(q)
+    else:
+        thresh = causal_threshold(out[strength_col], q, mode, window, min_periods)
+        out["cyclic_threshold"] = thresh
+
     out["cyclic_regime"] = np.where(
         out[strength_col] >= thresh, "Cyclic", "Non-Cyclic"
     )
-    return out, float(thresh)
+    if mode == "full":
+        return out, float(thresh)
+    return out, thresh
+
+
+def causal_threshold(
+    strength: pd.Series | pd.DataFrame,
+    q: float = 0.95,
+    mode: str = "expanding",
+    window: int | None = None,
+    min_periods: int = 12,
+) -> pd.Series | pd.DataFrame:
+    """
+    Quantile threshold using only past and current observations.
+
+    "expanding": P² streaming estimate (O(1) per observation, all columns
+    of a frame updated together). "rolling": exact quantile of the last
+    `window` observations (pandas rolling). NaN until min_periods values
+    have been seen.
+    """
+    if mode not in THRESHOLD_MODES[1:]:
+        raise ValueError(f"Unknown causal threshold mode: {mode}")
+
+    if mode == "rolling":
+        if window is None:
+            raise ValueError("mode='rolling' requires a window")
+        return strength.rolling(window, min_periods=min_periods).quantile(q)
+
+    frame = strength.to_frame() if isinstance(strength, pd.Series) else strength
+    x = frame.to_numpy(dtype=float)
+
+    sketch = P2Quantile(q, n_streams=x.shape[1])
+    out = np.empty_like(x)
+    for t in range(len(x)):
+        sketch.update(x[t])
+        out[t] = sketch.value()
+    out[np.cumsum(np.isfinite(x), axis=0) < min_periods] = np.nan
+
+    result = pd.DataFrame(out, index=frame.index, columns=frame.columns)
+    if isinstance(strength, pd.Series):
+        return result.iloc[:, 0].rename(strength.name)
+    return result
+
+
+class P2Quantile:
+    """
+    P² quantile estimator (Jain & Chlamtac, 1985) for n_streams
+    independent streams, updated together.
+
+    Five markers per stream track the min, max, the q quantile and two
+    intermediate quantiles; each update moves at most three of them by
+    one position with piecewise-parabolic interpolation. Memory and time
+    per observation are O(1). Until five values have arrived the exact
+    (linear-interpolated) quantile is used. NaN inputs are skipped.
+    """
+
+    def __init__(self, q: float, n_streams: int = 1):
+        if not 0 < q < 1:
+            raise ValueError("q must be in (0, 1)")
+        self.q = q
+        self.heights = np.zeros((n_streams, 5))
+        self.pos = np.tile(np.arange(1.0, 6.0), (n_streams, 1))
+        self.desired = np.tile([1.0, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5.0], (n_streams, 1))
+        self.step = np.array([0.0, q / 2, q, (1 + q) / 2, 1.0])
+        self.count = np.zeros(n_streams, dtype=np.int64)
+
+    def update(self, x) -> None:
+        x = np.broadcast_to(np.asarray(x, dtype=float), self.count.shape)
+        ok = np.isfinite(x)
+
+        # warm-up: collect the first five values
+        warm = ok & (self.count < 5)
+        if warm.any():
+            rows = np.flatnonzero(warm)
+            self.heights[rows, self.count[rows]] = x[rows]
+            self.count[rows] += 1
+            full = rows[self.count[rows] == 5]
+            self.heights[full] = np.sort(self.heights[full], axis=1)
+
+        live = ok & ~warm
+        if live.all():
+            self._update(slice(None), x)
+            self.count += 1
+        elif live.any():
+            rows = np.flatnonzero(live)
+            self._update(rows, x[rows])
+            self.count[rows] += 1
+
+    def _update(self, rows, x: np.ndarray) -> None:
+        h = self.heights[rows]
+        n = self.pos[rows]
+
+        h[:, 0] = np.minimum(h[:, 0], x)
+        h[:, 4] = np.maximum(h[:, 4], x)
+        cell = (x[:, None] >= h[:, 1:4]).sum(axis=1)
+
+        n += np.arange(5)[None, :] > cell[:, None]
+        desired = self.desired[rows] + self.step
+
+        for i in (1, 2, 3):
+            d = desired[:, i] - n[:, i]
+            move = ((d >= 1) & (n[:, i + 1] - n[:, i] > 1)) | (
+                (d <= -1) & (n[:, i - 1] - n[:, i] < -1)
+            )
+            if not move.any():
+                continue
+
+            s = np.sign(d[move])
+            hm, hi, hp = h[move, i - 1], h[move, i], h[move, i + 1]
+            nm, ni, np_ = n[move, i - 1], n[move, i], n[move, i + 1]
+
+            parabolic = hi + s / (np_ - nm) * (
+                (ni - nm + s) * (hp - hi) / (np_ - ni)
+                + (np_ - ni - s) * (hi - hm) / (ni - nm)
+            )
+            nb_h = np.where(s > 0, hp, hm)
+            nb_n = np.where(s > 0, np_, nm)
+            linear = hi + s * (nb_h - hi) / (nb_n - ni)
+
+            h[move, i] = np.where((hm < parabolic) & (parabolic < hp), parabolic, linear)
+            n[move, i] = ni + s
+
+        self.heights[rows] = h
+        self.pos[rows] = n
+        self.desired[rows] = desired
+
+    def value(self) -> np.ndarray:
+        out = self.heights[:, 2].copy()
+        for r in np.flatnonzero(self.count < 5):
+            c = self.count[r]
+            out[r] = np.quantile(self.heights[r, :c], self.q) if c else np.nan
+        return out
@@ -2,18 +2,29 @@
 import pandas as pd
 import numpy as np
 
+from .thresholds import causal_threshold
+
 def compute_threshold(
     strength: pd.Series,
     method: str = "quantile",
     q: float = 0.95,
-) -> float:
+    mode: str = "full",
+    window: int | None = None,
+    min_periods: int = 12,
+) -> float | pd.Series:
+    """
+    mode="full": one full-sample quantile. "expanding" / "rolling": a
+    per-date threshold from past observations only (causal_threshold).
+    """
     if method == "quantile":
-        return strength.quantile(q)
+        if mode == "full":
+            return strength.quantile(q)
+        return causal_threshold(strength, q, mode, window, min_periods)
     else:
         raise ValueError(f"Unknown threshold method: {method}")
 
 def apply_validity(
     strength: pd.Series,
-    threshold: float,
+    threshold: float | pd.Series,
 ) -> pd.Series:
     return strength >= threshold
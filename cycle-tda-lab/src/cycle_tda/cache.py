@@ -0,0 +1,232 @@
+# src/cycle_tda/cache.py
+
+import hashlib
+import os
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = 512 * 1024**2
+STALE_TMP_SECONDS = 3600  # temp files older than this are left by killed writers
+
+
+def hash_key(*arrays: np.ndarray, **params) -> str:
+    """
+    Content hash of arrays (dtype, shape and bytes) plus keyword parameters.
+    """
+    h = hashlib.sha256()
+    for a in arrays:
+        a = np.ascontiguousarray(a)
+        h.update(str(a.dtype).encode())
+        h.update(str(a.shape).encode())
+        h.update(a.tobytes())
+    for name in sorted(params):
+        h.update(f"|{name}={params[name]!r}".encode())
+    return h.hexdigest()
+
+
+class DiskCache:
+    """
+    Content-addressed on-disk store of named numpy arrays.
+
+    - one .npz file per key, sharded by the first two hex digits
+    - writes go to a temp file and are moved into place with os.replace,
+      so concurrent writers (e.g. a process pool) never expose partial files
+    - size-bounded: least recently used entries (by mtime, refreshed on
+      every hit) are evicted once the store exceeds max_bytes; the size is
+      scanned once and then tracked per writer (forks and pickled copies
+      start from the parent's estimate); merge_stats adds the bytes a fork
+      wrote to the parent and evicts there, so the bound holds for
+      process pools too
+    - temp files abandoned by killed writers are removed by size scans
+      and evictions once older than STALE_TMP_SECONDS
+    - hit/miss/write/eviction counters via stats()
+    """
+
+    def __init__(self, path: str | Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes)
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.bytes_written = 0
+        self._size_estimate = None
+
+    def __getstate__(self):
+        # scan here, once, rather than in every worker on its first write
+        if self._size_estimate is None:
+            self._size_estimate = self._scan_size()
+        return self.__dict__.copy()
+
+    def fork(self) -> "DiskCache":
+        """
+        Same store, fresh counters (for use inside worker tasks).
+        """
+        child = DiskCache(self.path, max_bytes=self.max_bytes)
+        child._size_estimate = self._size_estimate
+        return child
+
+    def counters(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "bytes_written": self.bytes_written,
+        }
+
+    def merge_stats(self, stats: dict) -> None:
+        """
+        Add counters reported by a forked cache, and the bytes it wrote to
+        the size estimate (evicting if the store is now over max_bytes).
+        """
+        self.hits += stats.get("hits", 0)
+        self.misses += stats.get("misses", 0)
+        self.writes += stats.get("writes", 0)
+        self.evictions += stats.get("evictions", 0)
+
+        written = stats.get("bytes_written", 0)
+        if not written:
+            return
+        self.bytes_written += written
+
+        # forks only see their own writes; the parent sees them all
+        if self._size_estimate is None:
+            self._size_estimate = self._scan_size()
+        else:
+            self._size_estimate += written
+        if self._size_estimate > self.max_bytes:
+            self._evict()
+
+    def _file(self, key: str) -> Path:
+        return self.path / key[:2] / f"{key}.npz"
+
+    # ----------------------------
+    # Read / write
+    # ----------------------------
+    def get(self, key: str) -> dict[str, np.ndarray] | None:
+        f = self._file(key)
+        try:
+            with np.load(f, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, zipfile.BadZipFile):
+            # truncated or foreign file: drop it and treat as a miss
+            _unlink(f)
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(f)
+        except OSError:
+            pass
+
+        self.hits += 1
+        return arrays
+
+    def put(self, key: str, arrays: dict[str, np.ndarray]) -> None:
+        f = self._file(key)
+        f.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp = tempfile.mkstemp(dir=f.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                np.savez(fh, **arrays)
+            os.replace(tmp, f)
+        except BaseException:
+            _unlink(Path(tmp))
+            raise
+
+        self.writes += 1
+        size = f.stat().st_size
+        self.bytes_written += size
+
+        if self._size_estimate is None:
+            self._size_estimate = self._scan_size()
+        else:
+            self._size_estimate += size
+
+        if self._size_estimate > self.max_bytes:
+            self._evict()
+
+    # ----------------------------
+    # Eviction / housekeeping
+    # ----------------------------
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        out = []
+        for f in self.path.glob("*/*.npz"):
+            try:
+                st = f.stat()
+            except FileNotFoundError:
+                continue
+            out.append((st.st_mtime, st.st_size, f))
+        return out
+
+    def _scan_size(self) -> int:
+        self._sweep_tmp()
+        return sum(size for _, size, _ in self._entries())
+
+    def _sweep_tmp(self) -> None:
+        """
+        Remove temp files of writers that died before os.replace.
+        """
+        cutoff = time.time() - STALE_TMP_SECONDS
+        for f in self.path.glob("*/*.tmp"):
+            try:
+                if f.stat().st_mtime < cutoff:
+                    f.unlink()
+            except FileNotFoundError:
+                continue
+
+    def _evict(self) -> None:
+        """
+        Remove least recently used entries down to 90% of max_bytes.
+        """
+        self._sweep_tmp()
+        entries = sorted(self._entries(), key=lambda e: e[0])
+        total = sum(size for _, size, _ in entries)
+        target = 0.9 * self.max_bytes
+
+        for _, size, f in entries:
+            if total <= target:
+                break
+            if _unlink(f):
+                self.evictions += 1
+            total -= size
+
+        self._size_estimate = total
+
+    def clear(self) -> None:
+        for _, _, f in self._entries():
+            _unlink(f)
+        self._size_estimate = 0
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else float("nan"),
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "n_entries": len(entries),
+            "size_bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+
+def _unlink(f: Path) -> bool:
+    try:
+        f.unlink()
+        return True
+    except FileNotFoundError:
+        return False
@@ -0,0 +1,515 @@
+# src/cycle_tda/coherence.py
+
+"""
+Cross-system Coherence Collapse Index (CCI).
+
+From a date x system matrix of PH z1 values:
+- on_frac: fraction of systems structurally ON (z1 above its null)
+- dispersion: cross-system std of per-system z-scored z1
+- corr_mean: mean |corr| over all system pairs in a trailing window
+
+CCI = -z(on_frac) + z(dispersion) - z(corr_mean); higher means more
+structural fragmentation.
+
+normalize="full" z-scores with full-sample statistics (the notebook 06
+definition); normalize="expanding" uses only data up to each date, which
+is what CCIState reproduces one month at a time.
+"""
+
+import bisect
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+CORR_WINDOW = 24  # months
+MIN_SYSTEMS = 3
+MIN_SYSTEMS_FRAC = 0.7
+SMOOTH = 3
+Q_HI = 0.85
+Q_LO = 0.15
+CORR_MAX_BYTES = 64 * 1024**2  # cap for one block of pairwise running sums
+ZERO_VAR_RTOL = 1e-10  # window variance below this (relative) counts as constant
+EPS = 1e-9
+NORMALIZE_MODES = ("full", "expanding")
+
+
+# ----------------------------
+# Inputs
+# ----------------------------
+def coherence_panels(
+    df: pd.DataFrame,
+    systems: list[str],
+    era: str = "Full",
+    min_present: int | None = None,
+    date_col: str = "end_date",
+) -> tuple[pd.DataFrame, pd.DataFrame | None]:
+    """
+    date x system z1 (and z1_null, if present) matrices from a
+    structural_ph_outputs table, restricted to dates where at least
+    min_present systems are available.
+    """
+    if min_present is None:
+        min_present = max(MIN_SYSTEMS, int(np.ceil(MIN_SYSTEMS_FRAC * len(systems))))
+
+    if date_col in df.columns:
+        df = df.rename(columns={date_col: "date"})
+    else:
+        df = df.rename_axis("date").reset_index()
+
+    df = df[(df["era"] == era) & df["asset"].isin(systems)]
+
+    Z = df.pivot_table(index="date", columns="asset", values="z1", aggfunc="last").sort_index()
+
+    ZN = None
+    if "z1_null" in df.columns:
+        ZN = df.pivot_table(index="date", columns="asset", values="z1_null", aggfunc="last").sort_index()
+
+    mask = Z.notna().sum(axis=1) >= min_present
+    Z = Z.loc[mask].copy()
+    if ZN is not None:
+        ZN = ZN.reindex(index=Z.index, columns=Z.columns)
+
+    return Z, ZN
+
+
+def coherence_panels_from_store(
+    store,
+    systems: list[str],
+    era: str = "Full",
+    name: str = "structural_ph",
+    min_present: int | None = None,
+) -> tuple[pd.DataFrame, pd.DataFrame | None]:
+    """
+    Like coherence_panels, reading only z1 / z1_null of the requested
+    systems from a FeatureStore table.
+    """
+    cols = ["z1", "z1_null"]
+    df = store.read(name, columns=cols, assets=systems, eras=[era])
+    return coherence_panels(df, systems, era=era, min_present=min_present)
+
+
+# ----------------------------
+# Index
+# ----------------------------
+def coherence_index(
+    Z: pd.DataFrame,
+    ZN: pd.DataFrame | None = None,
+    corr_window: int = CORR_WINDOW,
+    smooth: int = SMOOTH,
+    q_hi: float = Q_HI,
+    q_lo: float = Q_LO,
+    min_systems: int = MIN_SYSTEMS,
+    normalize: str = "full",
+) -> pd.DataFrame:
+    """
+    Coherence Collapse Index from a date x system z1 matrix.
+
+    Parameters
+    ----------
+    Z : pd.DataFrame
+        z1 per date (rows) and system (columns); NaN where unavailable
+    ZN : pd.DataFrame, optional
+        Null z1, same shape. Without it, ON means z-scored z1 > 0.
+    corr_window : int
+        Trailing rows (excluding the current one) for corr_mean
+    min_systems : int
+        Fully observed systems needed in a window for corr_mean
+    normalize : {"full", "expanding"}
+        Statistics for the per-system and component z-scores and the
+        regime quantiles: full sample, or expanding (causal)
+
+    Returns
+    -------
+    pd.DataFrame
+        on_frac, dispersion, corr_mean, CCI, CCI_smooth,
+        coherence_regime; rows without a CCI are dropped.
+    """
+    if normalize not in NORMALIZE_MODES:
+        raise ValueError(f"Unknown normalize '{normalize}', expected one of {NORMALIZE_MODES}")
+    expanding = normalize == "expanding"
+
+    z = Z.to_numpy(dtype=float)
+
+    # per-system z-score, so one system doesn't dominate
+    if expanding:
+        z_z = ((Z - Z.expanding().mean()) / (Z.expanding().std(ddof=0) + EPS)).to_numpy()
+    else:
+        z_z = (z - np.nanmean(z, axis=0)) / (np.nanstd(z, axis=0) + EPS)
+
+    if ZN is not None:
+        on = z > ZN.to_numpy(dtype=float)
+    else:
+        on = z_z > 0
+    on_frac = on.mean(axis=1)
+
+    dispersion = np.full(len(z), np.nan)
+    rows = np.isfinite(z_z).sum(axis=1) > 1
+    dispersion[rows] = np.nanstd(z_z[rows], axis=1, ddof=1)
+
+    # |corr| is invariant to per-system affine rescaling, but expanding
+    # z-scores rescale every row differently, so use raw z1 there
+    corr_mean = rolling_mean_abs_corr(z if expanding else z_z, corr_window, min_systems=min_systems)
+
+    zscore = _expanding_zscore if expanding else _zscore
+    on_z = zscore(on_frac)
+    disp_z = zscore(dispersion)
+    corr_z = zscore(corr_mean)
+    cci = -on_z + disp_z - corr_z
+
+    cci_df = pd.DataFrame(
+        {
+            "on_frac": on_frac,
+            "dispersion": dispersion,
+            "corr_mean": corr_mean,
+            "CCI": cci,
+        },
+        index=Z.index,
+    ).dropna(subset=["CCI"])
+
+    cci_df["CCI_smooth"] = cci_df["CCI"].rolling(smooth, min_periods=1).mean()
+    cci_df["coherence_regime"] = label_regimes(
+        cci_df["CCI_smooth"], q_hi=q_hi, q_lo=q_lo, expanding=expanding
+    )
+
+    return cci_df
+
+
+def label_regimes(
+    cci: pd.Series,
+    q_hi: float = Q_HI,
+    q_lo: float = Q_LO,
+    expanding: bool = False,
+) -> pd.Series:
+    """
+    FRAGMENTATION at/above the q_hi quantile, COHERENT at/below q_lo,
+    TRANSITION otherwise. Quantiles are full-sample, or expanding.
+    """
+    if expanding:
+        hi = cci.expanding().quantile(q_hi)
+        lo = cci.expanding().quantile(q_lo)
+    else:
+        hi = cci.quantile(q_hi)
+        lo = cci.quantile(q_lo)
+
+    label = np.select([cci >= hi, cci <= lo], ["FRAGMENTATION", "COHERENT"], default="TRANSITION")
+    return pd.Series(label, index=cci.index)
+
+
+def rolling_mean_abs_corr(
+    x: np.ndarray,
+    window: int,
+    min_systems: int = MIN_SYSTEMS,
+    max_bytes: int = CORR_MAX_BYTES,
+) -> np.ndarray:
+    """
+    Mean |Pearson corr| over all column pairs in rows [i - window, i).
+
+    Only columns without NaN in the window take part, and at least
+    min_systems are required (else NaN). Pairs with a constant column
+    are skipped. Pair sums are window differences of running sums of
+    outer products, built in row blocks to bound memory: O(T * k^2).
+
+    Returns
+    -------
+    np.ndarray
+        Length len(x); NaN for the first `window` rows.
+    """
+    x = np.asarray(x, dtype=float)
+    T, k = x.shape
+    out = np.full(T, np.nan)
+    if T <= window:
+        return out
+
+    ok = np.isfinite(x)
+    # centre each column so the running sums stay well conditioned
+    v = np.where(ok, x - np.nanmean(np.where(ok, x, np.nan), axis=0), 0.0)
+
+    n_bad = np.concatenate([np.zeros((1, k), dtype=np.int64), np.cumsum(~ok, axis=0)])
+
+    ends = np.arange(window, T)
+    block = max(1, max_bytes // (8 * k * k) - window)
+
+    for b0 in range(0, len(ends), block):
+        e = ends[b0 : b0 + block]
+        r0 = e[0] - window  # first row used by this block
+
+        seg = v[r0 : e[-1]]
+        c1 = np.concatenate([np.zeros((1, k)), np.cumsum(seg, axis=0)])
+        c2 = np.concatenate([np.zeros((1, k, k)), np.cumsum(seg[:, :, None] * seg[:, None, :], axis=0)])
+
+        hi = e - r0
+        lo = hi - window
+        s1 = c1[hi] - c1[lo]  # (n, k)
+        s2 = c2[hi] - c2[lo]  # (n, k, k)
+
+        valid = (n_bad[e] - n_bad[e - window]) == 0  # (n, k)
+        out[e] = _mean_abs_corr(s1, s2, valid, window, min_systems)
+
+    return out
+
+
+def _mean_abs_corr(
+    s1: np.ndarray,
+    s2: np.ndarray,
+    valid: np.ndarray,
+    window: int,
+    min_systems: int,
+) -> np.ndarray:
+    """
+    Mean |corr| over usable pairs from window sums s1 (n, k), s2 (n, k, k).
+    """
+    iu = np.triu_indices(s1.shape[1], 1)
+
+    cov = s2 - s1[:, :, None] * s1[:, None, :] / window
+    var = np.diagonal(cov, axis1=1, axis2=2)
+    sq = np.diagonal(s2, axis1=1, axis2=2)
+
+    varying = var > ZERO_VAR_RTOL * np.maximum(sq, np.finfo(float).tiny)
+    use = valid & varying
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sd = np.sqrt(np.where(use, var, np.nan))
+        corr = np.abs(cov[:, iu[0], iu[1]] / (sd[:, iu[0]] * sd[:, iu[1]]))
+
+    corr = np.minimum(corr, 1.0)
+    n_pairs = np.isfinite(corr).sum(axis=1)
+    total = np.where(np.isfinite(corr), corr, 0.0).sum(axis=1)
+
+    enough = (valid.sum(axis=1) >= min_systems) & (n_pairs > 0)
+    return np.where(enough, total / np.maximum(n_pairs, 1), np.nan)
+
+
+def _zscore(x: np.ndarray) -> np.ndarray:
+    return (x - np.nanmean(x)) / (np.nanstd(x) + EPS)
+
+
+def _expanding_zscore(x: np.ndarray) -> np.ndarray:
+    s = pd.Series(x).expanding()
+    return ((x - s.mean()) / (s.std(ddof=0) + EPS)).to_numpy()
+
+
+# ----------------------------
+# Online
+# ----------------------------
+class CCIState:
+    """
+    Month-by-month CCI with expanding normalization.
+
+    Each update costs O(k^2) for k systems (plus an O(log T) insert for
+    the regime quantiles). Stepping a panel through update() reproduces
+    coherence_index(Z, ZN, normalize="expanding") on the same panel.
+    Full-sample normalization is not causal (every new month moves all
+    past z-scores), so it has no exact online form.
+
+    Usage
+    -----
+    state = CCIState(TOP_SYSTEMS)
+    state.warm_up(Z, ZN)                              # history
+    row = state.update(date, z1_row, z1_null_row)     # new month
+    """
+
+    def __init__(
+        self,
+        systems: list[str],
+        corr_window: int = CORR_WINDOW,
+        smooth: int = SMOOTH,
+        q_hi: float = Q_HI,
+        q_lo: float = Q_LO,
+        min_systems: int = MIN_SYSTEMS,
+        min_present: int | None = None,
+    ):
+        self.systems = list(systems)
+        self.corr_window = corr_window
+        self.smooth = smooth
+        self.q_hi = q_hi
+        self.q_lo = q_lo
+        self.min_systems = min_systems
+        if min_present is None:
+            min_present = max(MIN_SYSTEMS, int(np.ceil(MIN_SYSTEMS_FRAC * len(systems))))
+        self.min_present = min_present
+
+        k = len(self.systems)
+
+        # per-system Welford stats of z1
+        self._n = np.zeros(k, dtype=np.int64)
+        self._mean = np.zeros(k)
+        self._m2 = np.zeros(k)
+
+        # trailing window of raw z1 (shifted) and its running sums
+        self._shift = np.full(k, np.nan)
+        self._buf = deque()
+        self._s1 = np.zeros(k)
+        self._s2 = np.zeros((k, k))
+        self._n_bad = np.zeros(k, dtype=np.int64)
+        self._since_refresh = 0
+
+        # Welford stats of on_frac / dispersion / corr_mean
+        self._comp = {c: [0, 0.0, 0.0] for c in ("on_frac", "dispersion", "corr_mean")}
+
+        self._recent = deque(maxlen=smooth)
+        self._sorted: list[float] = []
+        self._rows: list[dict] = []
+        self._dates: list = []
+
+    @property
+    def history(self) -> pd.DataFrame:
+        """
+        All emitted CCI rows, as coherence_index returns them.
+        """
+        return pd.DataFrame(self._rows, index=pd.Index(self._dates, name="date"))
+
+    def warm_up(self, Z: pd.DataFrame, ZN: pd.DataFrame | None = None) -> pd.DataFrame:
+        """
+        Step through a date x system panel; returns the history.
+        """
+        Z = Z.reindex(columns=self.systems)
+        if ZN is not None:
+            ZN = ZN.reindex(index=Z.index, columns=self.systems)
+
+        for i, date in enumerate(Z.index):
+            self.update(date, Z.iloc[i], None if ZN is None else ZN.iloc[i])
+        return self.history
+
+    def update(self, date, z1, z1_null=None) -> pd.Series | None:
+        """
+        Add one month of z1 (and z1_null) values.
+
+        z1 / z1_null are Series or dicts keyed by system (missing = NaN).
+        Returns the new CCI row, or None if the month has too few systems
+        or no CCI yet.
+        """
+        z = self._vector(z1)
+        present = np.isfinite(z)
+        if present.sum() < self.min_present:
+            return None
+
+        # ---- per-system expanding z-score
+        self._n += present
+        delta = np.where(present, z - self._mean, 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self._mean += np.where(present, delta / np.maximum(self._n, 1), 0.0)
+        self._m2 += np.where(present, delta * (np.where(present, z, 0.0) - self._mean), 0.0)
+
+        std = np.sqrt(self._m2 / np.maximum(self._n, 1))
+        z_z = np.where(present, (z - self._mean) / (std + EPS), np.nan)
+
+        # ---- ON fraction
+        if z1_null is not None:
+            on = z > self._vector(z1_null)
+        else:
+            on = z_z > 0
+        on_frac = float(on.mean())
+
+        # ---- dispersion
+        dispersion = float(np.std(z_z[present], ddof=1)) if present.sum() > 1 else np.nan
+
+        # ---- alignment over the trailing window (excluding this month)
+        if len(self._buf) == self.corr_window:
+            valid = (self._n_bad == 0)[None, :]
+            corr_mean = float(
+                _mean_abs_corr(self._s1[None], self._s2[None], valid, self.corr_window, self.min_systems)[0]
+            )
+        else:
+            corr_mean = np.nan
+        self._push(z, present)
+
+        # ---- components
+        comps = {"on_frac": on_frac, "dispersion": dispersion, "corr_mean": corr_mean}
+        zs = {c: self._component_z(c, v) for c, v in comps.items()}
+        cci = -zs["on_frac"] + zs["dispersion"] - zs["corr_mean"]
+
+        if not np.isfinite(cci):
+            return None
+
+        self._recent.append(cci)
+        cci_smooth = float(np.mean(self._recent))
+
+        bisect.insort(self._sorted, cci_smooth)
+        hi = _sorted_quantile(self._sorted, self.q_hi)
+        lo = _sorted_quantile(self._sorted, self.q_lo)
+        if cci_smooth >= hi:
+            regime = "FRAGMENTATION"
+        elif cci_smooth <= lo:
+            regime = "COHERENT"
+        else:
+            regime = "TRANSITION"
+
+        row = {
+            **comps,
+            "CCI": cci,
+            "CCI_smooth": cci_smooth,
+            "coherence_regime": regime,
+        }
+        self._rows.append(row)
+        self._dates.append(date)
+        return pd.Series(row, name=date)
+
+    def _vector(self, values) -> np.ndarray:
+        if isinstance(values, pd.Series):
+            values = values.to_dict()
+        return np.array([values.get(s, np.nan) for s in self.systems], dtype=float)
+
+    def _push(self, z: np.ndarray, present: np.ndarray) -> None:
+        new_cols = present & np.isnan(self._shift)
+        self._shift[new_cols] = z[new_cols]
+        v = np.where(present, z - self._shift, 0.0)
+
+        self._buf.append((v, ~present))
+        self._s1 += v
+        self._s2 += np.outer(v, v)
+        self._n_bad += ~present
+
+        if len(self._buf) > self.corr_window:
+            old, old_bad = self._buf.popleft()
+            self._s1 -= old
+            self._s2 -= np.outer(old, old)
+            self._n_bad -= old_bad
+
+        # re-sum the window now and then so add/remove drift cannot build up
+        self._since_refresh += 1
+        if self._since_refresh >= self.corr_window:
+            rows = np.array([b[0] for b in self._buf])
+            self._s1 = rows.sum(axis=0)
+            self._s2 = rows.T @ rows
+            self._since_refresh = 0
+
+    def _component_z(self, name: str, x: float) -> float:
+        stats = self._comp[name]
+        if np.isfinite(x):
+            stats[0] += 1
+            delta = x - stats[1]
+            stats[1] += delta / stats[0]
+            stats[2] += delta * (x - stats[1])
+        if stats[0] == 0:
+            return np.nan
+        return (x - stats[1]) / (np.sqrt(stats[2] / stats[0]) + EPS)
+
+    # ----------------------------
+    # Persistence
+    # ----------------------------
+    def save(self, path: str | Path) -> None:
+        """
+        Pickle the state.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pd.to_pickle(self, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "CCIState":
+        state = pd.read_pickle(Path(path))
+        if not isinstance(state, cls):
+            raise TypeError(f"{path}: not a {cls.__name__}")
+        return state
+
+
+def _sorted_quantile(values: list[float], q: float) -> float:
+    """
+    Linear-interpolation quantile of an already sorted list.
+    """
+    pos = q * (len(values) - 1)
+    i = int(np.floor(pos))
+    j = min(i + 1, len(values) - 1)
+    return values[i] + (values[j] - values[i]) * (pos - i)
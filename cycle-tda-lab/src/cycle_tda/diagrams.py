@@ -0,0 +1,280 @@
+# src/cycle_tda/diagrams.py
+
+"""
+Ragged storage of rolling persistence diagrams and batch features.
+
+A DiagramStore keeps, per homology dimension, all windows' (birth, death)
+pairs in two flat float32 arrays plus an int64 offsets array: the pairs of
+window i are births[offsets[i]:offsets[i + 1]]. Saved stores are plain
+.npy files and load memory-mapped.
+
+The batch functions below take (births, deaths, offsets) and return one
+value (or curve) per window, with no Python loop over windows.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+LANDSCAPE_MAX_BYTES = 64 * 1024**2  # cap for one chunk of tent functions
+INDEX_COLUMNS = ["run", "window", "m", "tau", "end_date"]
+
+
+class DiagramStore:
+    """
+    Collects the diagrams of rolling_ph windows (pass as diagrams=store).
+
+    Usage
+    -----
+    store = DiagramStore()
+    rolling_ph(series, 120, m=3, tau=2, diagrams=store)
+    store.save("data/processed/diagrams/xau_w120")
+
+    store = DiagramStore.load("data/processed/diagrams/xau_w120")
+    b, d, off = store.dim(1)
+    entropy = persistence_entropy(b, d, off)
+    """
+
+    def __init__(self, maxdim: int = 1):
+        self.maxdim = maxdim
+        self._index: list[dict] = []
+        self._pending: list[list[np.ndarray]] = []
+        self._arrays: dict[int, tuple[np.ndarray, np.ndarray, np.ndarray]] | None = None
+        self._n_runs = 0
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def start_run(self) -> int:
+        self._n_runs += 1
+        return self._n_runs
+
+    def add(self, meta: list[dict], dgms: list[list[np.ndarray]]) -> None:
+        """
+        Append windows: meta rows (INDEX_COLUMNS) and their diagrams.
+        """
+        if self._arrays is not None:
+            self._thaw()
+        self._index.extend(meta)
+        self._pending.extend(dgms)
+
+    @property
+    def index(self) -> pd.DataFrame:
+        """
+        One row per stored window (run, window, m, tau, end_date).
+        """
+        return pd.DataFrame(self._index, columns=INDEX_COLUMNS)
+
+    def dim(self, d: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (births, deaths, offsets) of dimension d for all windows.
+        """
+        self._freeze()
+        return self._arrays[d]
+
+    def diagram(self, i: int, d: int = 1) -> np.ndarray:
+        """
+        Diagram of window i as an (n, 2) array.
+        """
+        b, dth, off = self.dim(d)
+        return np.column_stack([b[off[i] : off[i + 1]], dth[off[i] : off[i + 1]]])
+
+    # ----------------------------
+    # Layout
+    # ----------------------------
+    def _freeze(self) -> None:
+        if self._arrays is not None:
+            return
+
+        self._arrays = {}
+        for d in range(self.maxdim + 1):
+            parts = [np.asarray(dg[d], dtype=np.float32).reshape(-1, 2) for dg in self._pending]
+            counts = np.array([len(p) for p in parts], dtype=np.int64)
+            offsets = np.concatenate([[0], np.cumsum(counts)])
+            flat = np.concatenate(parts) if parts else np.empty((0, 2), dtype=np.float32)
+            self._arrays[d] = (
+                np.ascontiguousarray(flat[:, 0]),
+                np.ascontiguousarray(flat[:, 1]),
+                offsets,
+            )
+
+    def _thaw(self) -> None:
+        self._pending = [
+            [self.diagram(i, d) for d in range(self.maxdim + 1)] for i in range(len(self._index))
+        ]
+        self._arrays = None
+
+    # ----------------------------
+    # Persistence
+    # ----------------------------
+    def save(self, path: str | Path) -> None:
+        """
+        Write h{d}_births/deaths/offsets.npy and index.pkl under `path`.
+        """
+        self._freeze()
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        for d, (b, dth, off) in self._arrays.items():
+            np.save(path / f"h{d}_births.npy", b)
+            np.save(path / f"h{d}_deaths.npy", dth)
+            np.save(path / f"h{d}_offsets.npy", off)
+        pd.to_pickle({"maxdim": self.maxdim, "index": self._index}, path / "index.pkl")
+
+    @classmethod
+    def load(cls, path: str | Path, mmap: bool = True) -> "DiagramStore":
+        path = Path(path)
+        meta = pd.read_pickle(path / "index.pkl")
+        mode = "r" if mmap else None
+
+        store = cls(maxdim=meta["maxdim"])
+        store._index = meta["index"]
+        store._n_runs = max((row["run"] for row in store._index), default=0)
+        store._arrays = {
+            d: tuple(np.load(path / f"h{d}_{part}.npy", mmap_mode=mode) for part in ("births", "deaths", "offsets"))
+            for d in range(store.maxdim + 1)
+        }
+        return store
+
+
+# ----------------------------
+# Batch features
+# ----------------------------
+def _window_ids(offsets: np.ndarray) -> np.ndarray:
+    return np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+
+
+def _finite_persistence(births, deaths, offsets):
+    """
+    Persistence of finite pairs and the window id of each.
+    """
+    pers = np.asarray(deaths, dtype=float) - np.asarray(births, dtype=float)
+    ids = _window_ids(offsets)
+    ok = np.isfinite(pers)
+    return pers[ok], ids[ok]
+
+
+def batch_norms(births, deaths, offsets) -> pd.DataFrame:
+    """
+    l1, l2, z1 (mean persistence) and max persistence per window, as
+    persistence_norms / max_h1_persistence (infinite pairs ignored).
+    """
+    n = len(offsets) - 1
+    pers, ids = _finite_persistence(births, deaths, offsets)
+
+    count = np.bincount(ids, minlength=n)
+    l1 = np.bincount(ids, weights=pers, minlength=n)
+    l2 = np.sqrt(np.bincount(ids, weights=pers * pers, minlength=n))
+
+    max_p = np.zeros(n)
+    np.maximum.at(max_p, ids, pers)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z1 = np.where(count > 0, l1 / np.maximum(count, 1), 0.0)
+
+    return pd.DataFrame({"l1": l1, "l2": l2, "z1": z1, "max_persistence": max_p})
+
+
+def persistence_entropy(births, deaths, offsets, normalize: bool = False) -> np.ndarray:
+    """
+    Shannon entropy of each window's persistence distribution
+    p_i = pers_i / sum(pers). With normalize, divided by log(n_pairs).
+    Windows without finite pairs get 0.
+    """
+    n = len(offsets) - 1
+    pers, ids = _finite_persistence(births, deaths, offsets)
+    keep = pers > 0
+    pers, ids = pers[keep], ids[keep]
+
+    total = np.bincount(ids, weights=pers, minlength=n)
+    p = pers / total[ids]
+    entropy = -np.bincount(ids, weights=p * np.log(p), minlength=n)
+
+    if normalize:
+        count = np.bincount(ids, minlength=n)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            entropy = np.where(count > 1, entropy / np.log(np.maximum(count, 2)), 0.0)
+
+    return entropy
+
+
+def betti_curves(births, deaths, offsets, grid: np.ndarray) -> np.ndarray:
+    """
+    Number of pairs alive (birth <= t < death) at each grid value t.
+
+    Returns
+    -------
+    np.ndarray
+        Shape (n_windows, len(grid))
+    """
+    n = len(offsets) - 1
+    grid = np.asarray(grid, dtype=float)
+    ids = _window_ids(offsets)
+
+    # +1 from the first grid point >= birth, -1 from the first >= death
+    b_idx = np.searchsorted(grid, np.asarray(births, dtype=float), side="left")
+    d_idx = np.searchsorted(grid, np.asarray(deaths, dtype=float), side="left")
+
+    delta = np.zeros((n, len(grid) + 1), dtype=np.int64)
+    np.add.at(delta, (ids, b_idx), 1)
+    np.add.at(delta, (ids, d_idx), -1)
+
+    return np.cumsum(delta, axis=1)[:, :-1]
+
+
+def landscapes(
+    births,
+    deaths,
+    offsets,
+    grid: np.ndarray,
+    k: int = 3,
+    max_bytes: int = LANDSCAPE_MAX_BYTES,
+) -> np.ndarray:
+    """
+    First k persistence landscapes of each window on `grid`.
+
+    lambda_j(t) is the j-th largest tent max(0, min(t - b, d - t)) over a
+    window's pairs (infinite pairs ignored). Diagrams are padded to the
+    largest pair count and processed in chunks of windows.
+
+    Returns
+    -------
+    np.ndarray
+        Shape (n_windows, k, len(grid))
+    """
+    n = len(offsets) - 1
+    grid = np.asarray(grid, dtype=float)
+    b = np.asarray(births, dtype=float)
+    d = np.asarray(deaths, dtype=float)
+    ids = _window_ids(offsets)
+
+    ok = np.isfinite(d - b)
+    b, d, ids = b[ok], d[ok], ids[ok]
+
+    counts = np.bincount(ids, minlength=n)
+    width = max(int(counts.max()) if n else 0, k)
+
+    # position of each pair within its window
+    starts = np.concatenate([[0], np.cumsum(counts)])[:-1]
+    slot = np.arange(len(ids)) - starts[ids]
+
+    # padding pairs have zero tents (birth = death = 0)
+    B = np.zeros((n, width))
+    D = np.zeros((n, width))
+    B[ids, slot] = b
+    D[ids, slot] = d
+
+    out = np.empty((n, k, len(grid)))
+    step = max(1, max_bytes // (8 * width * max(len(grid), 1)))
+    for i0 in range(0, n, step):
+        i1 = min(n, i0 + step)
+        t = grid[None, None, :]
+        tents = np.minimum(t - B[i0:i1, :, None], D[i0:i1, :, None] - t)
+        np.maximum(tents, 0.0, out=tents)
+
+        # k largest along the pair axis, in descending order
+        top = -np.partition(-tents, np.arange(k), axis=1)[:, :k]
+        out[i0:i1] = top
+
+    return out
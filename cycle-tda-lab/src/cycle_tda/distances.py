@@ -0,0 +1,91 @@
+# src/cycle_tda/distances.py
+
+import numpy as np
+
+DISTANCE_MAX_BYTES = 256 * 1024**2  # cap for one block of shared distances
+
+
+def delay_distance_matrix(
+    y: np.ndarray,
+    m: int,
+    tau: int,
+    lo: int,
+    hi: int,
+) -> np.ndarray:
+    """
+    Euclidean distances between delay-embedded points lo..hi-1 of y.
+
+    Point i is (y[i], y[i + tau], ..., y[i + (m-1)*tau]). The squared
+    sample differences are computed once and the m coordinates are added
+    as shifted views, so no point cloud is materialized.
+
+    Returns
+    -------
+    np.ndarray
+        Shape (hi - lo, hi - lo)
+    """
+    n = hi - lo
+    span = (m - 1) * tau
+    seg = np.asarray(y[lo : hi + span], dtype=float)
+
+    if len(seg) < n + span:
+        raise ValueError("Time series too short for chosen m, tau and point range.")
+
+    sq = seg[:, None] - seg[None, :]
+    sq *= sq
+
+    D = sq[:n, :n].copy()
+    for k in range(1, m):
+        o = k * tau
+        D += sq[o : o + n, o : o + n]
+
+    return np.sqrt(D, out=D)
+
+
+def block_bytes(n_points: int, m: int, tau: int) -> int:
+    """
+    Peak memory of delay_distance_matrix for n_points points.
+    """
+    n_samples = n_points + (m - 1) * tau
+    return 8 * (n_samples * n_samples + n_points * n_points)
+
+
+def plan_blocks(
+    starts: np.ndarray,
+    n_points,
+    m: int,
+    tau: int,
+    max_bytes: int = DISTANCE_MAX_BYTES,
+) -> list[tuple[int, int]]:
+    """
+    Group consecutive windows into blocks sharing one distance matrix.
+
+    Windows (sorted by first embedded point `starts`, each n_points long;
+    n_points may be an array for windows of different lengths) are added
+    to a block while the block's distance matrix stays within max_bytes.
+    A window that alone exceeds the cap gets its own block.
+
+    Returns
+    -------
+    list of (i0, i1)
+        Half-open index ranges into `starts`
+    """
+    stops = np.asarray(starts, dtype=np.int64) + np.asarray(n_points, dtype=np.int64)
+    stops = np.broadcast_to(stops, np.shape(starts))
+
+    blocks = []
+    i0 = 0
+    top = 0
+    for i in range(1, len(starts) + 1):
+        top = max(top, int(stops[i - 1]))
+        if i == len(starts):
+            blocks.append((i0, i))
+            break
+
+        span = max(top, int(stops[i])) - int(starts[i0])
+        if block_bytes(span, m, tau) > max_bytes:
+            blocks.append((i0, i))
+            i0 = i
+            top = 0
+
+    return blocks
@@ -0,0 +1,248 @@
+# src/cycle_tda/download.py
+
+"""
+Concurrent, incremental downloads of raw CSV series.
+
+- requests run on a thread pool (max_workers at a time), with retries and
+  exponential backoff on network errors, 429 and 5xx responses
+- each URL's last body is kept in cache_dir with its ETag / Last-Modified;
+  later requests are conditional and a 304 reuses the cached body
+- cleaned frames are merged into the existing CSV: stored rows before the
+  last stored date are kept and only later observations are added (the
+  last stored date is refreshed, as it may be a partial month)
+
+The HTTP layer is a plain callable client(url, headers, timeout) ->
+(status, headers, body), so tests can point it at a local server or fake.
+"""
+
+import hashlib
+import io
+import json
+import random
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+from .io import _write_atomic
+
+MAX_WORKERS = 8
+RETRIES = 3
+BACKOFF = 0.5  # seconds, doubled per retry (plus jitter)
+TIMEOUT = 30.0
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+USER_AGENT = "cycle-tda-lab/downloader"
+
+
+class DownloadError(RuntimeError):
+    pass
+
+
+def urllib_client(url: str, headers: dict, timeout: float) -> tuple[int, dict, bytes]:
+    """
+    Default HTTP client (standard library).
+    """
+    req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT, **headers})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return resp.status, dict(resp.headers), resp.read()
+    except urllib.error.HTTPError as e:
+        # 304 and error statuses arrive as exceptions
+        return e.code, dict(e.headers or {}), b""
+
+
+def read_csv_bytes(body: bytes) -> pd.DataFrame:
+    return pd.read_csv(io.BytesIO(body))
+
+
+def merge_observations(
+    existing: pd.DataFrame | None,
+    new: pd.DataFrame,
+    date_col: str = "date",
+) -> tuple[pd.DataFrame, int]:
+    """
+    Stored rows before the last stored date, plus downloaded rows from
+    that date on.
+
+    Returns
+    -------
+    (merged, n_new)
+        n_new counts rows with a date after the last stored one
+    """
+    new = new.sort_values(date_col).reset_index(drop=True)
+    if existing is None or len(existing) == 0:
+        return new, len(new)
+
+    existing = existing.copy()
+    existing[date_col] = pd.to_datetime(existing[date_col], errors="coerce")
+    last = existing[date_col].max()
+
+    merged = pd.concat(
+        [existing[existing[date_col] < last], new[new[date_col] >= last]],
+        ignore_index=True,
+    )
+    merged = merged.drop_duplicates(subset=date_col, keep="last").sort_values(date_col)
+    return merged.reset_index(drop=True), int((new[date_col] > last).sum())
+
+
+class Downloader:
+    """
+    Fetch and merge a set of CSV series concurrently.
+
+    Jobs map a name to a dict with
+    - url: source URL
+    - clean: callable(bytes) -> DataFrame with a date column
+    - path: target CSV
+    - date_col: name of the date column (default "date")
+
+    Usage
+    -----
+    dl = Downloader("data/raw/.http_cache")
+    log = dl.run({"CPI_Monthly.csv": {"url": ..., "clean": ..., "path": ...}})
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        client=urllib_client,
+        max_workers: int = MAX_WORKERS,
+        retries: int = RETRIES,
+        backoff: float = BACKOFF,
+        timeout: float = TIMEOUT,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.client = client
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+
+    # ----------------------------
+    # HTTP
+    # ----------------------------
+    def _files(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode()).hexdigest()[:24]
+        return self.cache_dir / f"{key}.body", self.cache_dir / f"{key}.json"
+
+    def fetch(self, url: str) -> tuple[bytes, bool]:
+        """
+        Body of `url` and whether it was served from cache (304).
+        """
+        body_file, meta_file = self._files(url)
+
+        headers = {}
+        cached = body_file.exists() and meta_file.exists()
+        if cached:
+            meta = json.loads(meta_file.read_text())
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        status, resp_headers, body = self._request(url, headers)
+
+        if status == 304 and cached:
+            return body_file.read_bytes(), True
+        if status != 200:
+            raise DownloadError(f"{url}: HTTP {status}")
+
+        resp_headers = {k.lower(): v for k, v in resp_headers.items()}
+        _write_atomic(body_file, lambda fh: fh.write(body))
+        meta = {
+            "url": url,
+            "etag": resp_headers.get("etag"),
+            "last_modified": resp_headers.get("last-modified"),
+            "fetched": pd.Timestamp.now(tz="UTC").isoformat(),
+        }
+        _write_atomic(meta_file, lambda fh: fh.write(json.dumps(meta).encode()))
+        return body, False
+
+    def _request(self, url: str, headers: dict) -> tuple[int, dict, bytes]:
+        for attempt in range(self.retries + 1):
+            last = attempt == self.retries
+            try:
+                status, resp_headers, body = self.client(url, headers, self.timeout)
+            except (OSError, urllib.error.URLError) as e:
+                if last:
+                    raise DownloadError(f"{url}: {e}") from e
+            else:
+                if status not in RETRY_STATUSES or last:
+                    return status, resp_headers, body
+            time.sleep(self.backoff * 2**attempt * (1 + random.random()))
+
+    # ----------------------------
+    # Jobs
+    # ----------------------------
+    def run(self, jobs: dict[str, dict], on_event=None) -> pd.DataFrame:
+        """
+        Fetch, clean and merge every job; failures are logged, not raised.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per job: name, status (updated / unchanged /
+            not_modified / failed), rows, new_rows, start, end, seconds,
+            error
+        """
+        log_rows = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(self._run_job, name, job): name for name, job in jobs.items()}
+            for fut in as_completed(futures):
+                row = fut.result()
+                log_rows.append(row)
+                if on_event is not None:
+                    on_event(row)
+
+        order = {name: i for i, name in enumerate(jobs)}
+        return pd.DataFrame(sorted(log_rows, key=lambda r: order[r["name"]]))
+
+    def _run_job(self, name: str, job: dict) -> dict:
+        t0 = time.perf_counter()
+        row = {
+            "name": name,
+            "status": "failed",
+            "rows": 0,
+            "new_rows": 0,
+            "start": None,
+            "end": None,
+            "error": None,
+        }
+
+        try:
+            path = Path(job["path"])
+            date_col = job.get("date_col", "date")
+            body, not_modified = self.fetch(job["url"])
+
+            existing = pd.read_csv(path) if path.exists() else None
+            if not_modified and existing is not None:
+                row["status"] = "not_modified"
+                merged, n_new = existing, 0
+            else:
+                merged, n_new = merge_observations(existing, job["clean"](body), date_col)
+                changed = existing is None or not _same_rows(existing, merged)
+                if changed:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    _write_atomic(path, lambda fh: fh.write(merged.to_csv(index=False).encode()))
+                row["status"] = "updated" if changed else "unchanged"
+
+            dates = pd.to_datetime(merged[date_col], errors="coerce")
+            row.update(rows=len(merged), new_rows=n_new, start=dates.min(), end=dates.max())
+        except Exception as e:  # noqa: BLE001 - one bad series must not stop the refresh
+            row["error"] = f"{type(e).__name__}: {e}"
+
+        row["seconds"] = time.perf_counter() - t0
+        return row
+
+
+def _same_rows(stored: pd.DataFrame, merged: pd.DataFrame) -> bool:
+    """
+    Whether writing `merged` would reproduce the stored CSV.
+    """
+    if stored.shape != merged.shape:
+        return False
+    return stored.to_csv(index=False) == pd.read_csv(io.StringIO(merged.to_csv(index=False))).to_csv(index=False)
@@ -1,4 +1,5 @@
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 
 def delay_embedding(
@@ -32,3 +33,23 @@ def delay_embedding(
     return np.column_stack(
         [y[i : i + n_points] for i in range(0, m * tau, tau)]
     )
+
+
+def delay_embedding_view(
+    y: np.ndarray,
+    m: int,
+    tau: int,
+) -> np.ndarray:
+    """
+    Zero-copy time-delay embedding.
+
+    Same point cloud as delay_embedding, returned as a read-only strided
+    view of y instead of a copy.
+    """
+    y = np.asarray(y)
+    span = (m - 1) * tau + 1
+
+    if len(y) - span + 1 <= 0:
+        raise ValueError("Time series too short for chosen m and tau.")
+
+    return sliding_window_view(y, span)[:, ::tau]
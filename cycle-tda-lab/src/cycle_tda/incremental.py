@@ -0,0 +1,155 @@
+# src/cycle_tda/incremental.py
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .cache import DiskCache
+from .rolling import _rolling_frame, rolling_ph
+
+
+class RollingPHState:
+    """
+    Append-only rolling PH.
+
+    Keeps the series and rolling_ph output from the previous run. When the
+    series is extended, only windows ending after the stored history are
+    computed; if any stored observation was revised (or removed), the whole
+    history is recomputed.
+
+    Usage
+    -----
+    state = RollingPHState(window=60, m=3, tau=2)
+    df = state.update(series)          # full run
+    df = state.update(series_next)     # only the new windows
+    """
+
+    def __init__(
+        self,
+        window: int,
+        stride: int = 1,
+        m: int = 3,
+        tau: int = 1,
+        normalize: bool = True,
+        include_null: bool = False,
+        null_seed: int | None = None,
+        executor: str = "serial",
+        n_jobs: int | None = None,
+        cache: DiskCache | None = None,
+    ):
+        self.params = dict(
+            window=window,
+            stride=stride,
+            m=m,
+            tau=tau,
+            normalize=normalize,
+            include_null=include_null,
+            null_seed=null_seed,
+        )
+        self.executor = executor
+        self.n_jobs = n_jobs
+        self.cache = cache
+
+        self.series: pd.Series | None = None
+        self.results: pd.DataFrame | None = None
+        self.last_update = {"mode": None, "n_windows": 0}
+
+    def update(self, series: pd.Series) -> pd.DataFrame:
+        """
+        Bring the stored results up to date with `series`.
+
+        Returns the full rolling_ph frame for the (extended) series.
+        """
+        if not isinstance(series, pd.Series):
+            raise TypeError("series must be a pandas Series")
+
+        series = series.sort_index()
+
+        if self.series is None or not self._is_extension(series):
+            results = rolling_ph(
+                series,
+                executor=self.executor,
+                n_jobs=self.n_jobs,
+                cache=self.cache,
+                **self.params,
+            )
+            self._store(series, results, mode="full", n_windows=len(results))
+            return self.results
+
+        window = self.params["window"]
+        stride = self.params["stride"]
+        n_prev = len(self.series)
+
+        # Continue the original end-position grid: window, window+stride, ...
+        first = window + max(0, -(-(n_prev + 1 - window) // stride)) * stride
+        ends = list(range(first, len(series) + 1, stride))
+
+        if not ends:
+            self._store(series, self.results, mode="append", n_windows=0)
+            return self.results
+
+        new = _rolling_frame(
+            np.asarray(series.values, dtype=float),
+            series.index,
+            ends,
+            window=window,
+            m=self.params["m"],
+            tau=self.params["tau"],
+            normalize=self.params["normalize"],
+            executor=self.executor,
+            n_jobs=self.n_jobs,
+            chunk_size=None,
+            include_null=self.params["include_null"],
+            null_seed=self.params["null_seed"],
+            cache=self.cache,
+        )
+
+        if len(new) == 0:
+            results = self.results
+        elif len(self.results) == 0:
+            results = new
+        else:
+            results = pd.concat([self.results, new])
+
+        self._store(series, results, mode="append", n_windows=len(new))
+        return self.results
+
+    def _is_extension(self, series: pd.Series) -> bool:
+        """
+        True if `series` starts with the stored series, unrevised.
+        """
+        n_prev = len(self.series)
+        if len(series) < n_prev:
+            return False
+
+        head = series.iloc[:n_prev]
+        if not head.index.equals(self.series.index):
+            return False
+
+        old = np.asarray(self.series.values, dtype=float)
+        cur = np.asarray(head.values, dtype=float)
+        return bool(np.array_equal(old, cur, equal_nan=True))
+
+    def _store(self, series, results, mode, n_windows):
+        self.series = series.copy()
+        self.results = results
+        self.last_update = {"mode": mode, "n_windows": int(n_windows)}
+
+    # ----------------------------
+    # Persistence
+    # ----------------------------
+    def save(self, path: str | Path) -> None:
+        """
+        Pickle the state (parameters, series and results).
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pd.to_pickle(self, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "RollingPHState":
+        state = pd.read_pickle(Path(path))
+        if not isinstance(state, cls):
+            raise TypeError(f"{path}: not a {cls.__name__}")
+        return state
@@ -1,7 +1,14 @@
+import hashlib
+import json
+import os
+import tempfile
+
 import pandas as pd
 from pathlib import Path
 import numpy as np
 
+SERIES_DTYPE = np.dtype([("date", "i8"), ("value", "f8")])
+
 
 def load_csv(path, date_col="Date", value_col=None):
     """
@@ -44,6 +51,181 @@ def load_csv(path, date_col="Date", value_col=None):
     return df
 
 
+def load_series_auto(path: Path) -> pd.Series:
+    """
+    Load a two-column CSV (date + one value column) as a sorted Series.
+
+    The date column is the one named "date" (any case), or the first column
+    if it parses as dates for >90% of rows.
+    """
+    path = Path(path)
+    df = pd.read_csv(path)
+
+    # detect date column
+    date_col = None
+    for c in df.columns:
+        if c.lower() == "date":
+            date_col = c
+            break
+
+    # fallback: first column if datetime-like
+    if date_col is None:
+        first = df.columns[0]
+        parsed = pd.to_datetime(df[first], errors="coerce")
+        if parsed.notna().mean() > 0.9:
+            date_col = first
+
+    if date_col is None:
+        raise ValueError(f"{path.name}: no recognizable date column")
+
+    df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
+
+    value_cols = [c for c in df.columns if c != date_col]
+    if len(value_cols) != 1:
+        raise ValueError(
+            f"{path.name}: expected 1 value column, found {value_cols}"
+        )
+
+    return (
+        df
+        .set_index(date_col)[value_cols[0]]
+        .sort_index()
+        .dropna()
+    )
+
+
+def load_series_robust(path: Path) -> pd.Series:
+    """
+    Load a CSV as a sorted Series: "date" column (or the first column) as
+    index, first column with any numeric values as the value.
+    """
+    path = Path(path)
+    df = pd.read_csv(path)
+    date_col = None
+    for c in df.columns:
+        if c.lower() == "date":
+            date_col = c
+            break
+    if date_col is None:
+        date_col = df.columns[0]
+    df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
+    value_col = None
+    for c in df.columns:
+        if c != date_col:
+            df[c] = pd.to_numeric(df[c], errors="coerce")
+            if df[c].notna().sum() > 0:
+                value_col = c
+                break
+    if value_col is None:
+        raise ValueError(f"No numeric column found in {path}")
+    return df.set_index(date_col)[value_col].dropna().sort_index()
+
+
+def _load_series_csv(path: Path, **kwargs) -> pd.Series:
+    df = load_csv(Path(path), **kwargs)
+    date_col, value_col = df.columns
+    return df.set_index(date_col)[value_col]
+
+
+SERIES_LOADERS = {
+    "csv": _load_series_csv,
+    "auto": load_series_auto,
+    "robust": load_series_robust,
+}
+
+
+def load_series_cached(
+    path: str | Path,
+    loader: str = "auto",
+    cache_dir: str | Path | None = None,
+    mmap: bool = True,
+    **loader_kwargs,
+) -> pd.Series:
+    """
+    Load a raw series through a binary cache.
+
+    The first call parses the CSV with SERIES_LOADERS[loader] and stores
+    the result as a (date int64, value float64) .npy record array; later
+    calls memory-map it. The entry is invalidated when the source's
+    mtime/size changes and its content hash no longer matches.
+
+    Parameters
+    ----------
+    loader : {"csv", "auto", "robust"}
+        Which CSV loader defines the series; each has its own cache entry
+    cache_dir : path, optional
+        Defaults to `.series_cache` next to the source file
+    **loader_kwargs
+        Passed to the loader (e.g. date_col / value_col for "csv")
+    """
+    if loader not in SERIES_LOADERS:
+        raise ValueError(f"Unknown loader '{loader}', expected one of {list(SERIES_LOADERS)}")
+
+    path = Path(path)
+    cache_dir = Path(cache_dir) if cache_dir is not None else path.parent / ".series_cache"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    params = json.dumps(loader_kwargs, sort_keys=True, default=str)
+    tag = hashlib.sha256(f"{path.resolve()}|{loader}|{params}".encode()).hexdigest()[:16]
+    data_file = cache_dir / f"{path.stem}.{loader}.{tag}.npy"
+    meta_file = data_file.with_suffix(".json")
+
+    st = path.stat()
+    signature = {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+    meta = None
+    if data_file.exists() and meta_file.exists():
+        meta = json.loads(meta_file.read_text())
+        if {k: meta.get(k) for k in signature} != signature:
+            # touched: still valid if the content is unchanged
+            if meta.get("sha256") == _file_sha256(path):
+                meta.update(signature)
+                _write_atomic(meta_file, lambda fh: fh.write(json.dumps(meta).encode()))
+            else:
+                meta = None
+
+    if meta is None:
+        series = SERIES_LOADERS[loader](path, **loader_kwargs)
+        dates = series.index.values
+        unit = np.datetime_data(dates.dtype)[0]
+
+        rec = np.empty(len(series), dtype=SERIES_DTYPE)
+        rec["date"] = dates.view("i8")
+        rec["value"] = series.to_numpy(dtype=float)
+
+        meta = {
+            **signature,
+            "sha256": _file_sha256(path),
+            "unit": unit,
+            "name": series.name,
+            "index_name": series.index.name,
+        }
+        _write_atomic(data_file, lambda fh: np.save(fh, rec))
+        _write_atomic(meta_file, lambda fh: fh.write(json.dumps(meta, default=str).encode()))
+
+    rec = np.load(data_file, mmap_mode="r" if mmap else None)
+    index = pd.DatetimeIndex(rec["date"].view(f"M8[{meta['unit']}]"), name=meta["index_name"])
+    return pd.Series(rec["value"], index=index, name=meta["name"])
+
+
+def _file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _write_atomic(path: Path, write) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            write(fh)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
 
 def save_features(
     df: pd.DataFrame,
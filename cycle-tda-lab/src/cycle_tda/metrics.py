@@ -1,6 +1,7 @@
 # src/cycle_tda/metrics.py
 
 import numpy as np
+import pandas as pd
 
 
 def summarize_series(x: np.ndarray) -> dict:
@@ -25,3 +26,16 @@ def summarize_series(x: np.ndarray) -> dict:
 
 def usability_score(p90: float, cv: float) -> float:
     return p90 / (cv + 1e-12)
+
+
+def forecast_eligibility(z1: pd.Series, q_on: float = 0.75, q_off: float = 0.50) -> pd.Series:
+    """
+    Structural gate on z1: 1 (ON) above the q_on quantile, -1 (OFF) below
+    the q_off quantile, 0 (TRANSITION) in between.
+    """
+    hi = z1.quantile(q_on)
+    lo = z1.quantile(q_off)
+
+    # OFF wins when the quantiles coincide (the notebook assigned -1 last)
+    state = np.select([z1 <= lo, z1 >= hi], [-1, 1], default=0)
+    return pd.Series(state, index=z1.index, dtype=int)
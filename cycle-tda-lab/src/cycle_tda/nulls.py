@@ -0,0 +1,189 @@
+# src/cycle_tda/nulls.py
+
+"""
+Precomputed white-noise null distributions for rolling PH.
+
+With z-scored windows, the white-noise null of rolling_ph depends only on
+(window, m, tau) (and the approximate-PH settings, if any). A NullTable
+holds a seeded ensemble of null z1 / max_h1 values for one such key;
+NullTableStore builds them once, in parallel, and keeps them on disk.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from .embeddings import delay_embedding_view
+from .parallel import chunked, resolve_n_jobs, run_tasks
+from .ph import cap_deaths, compute_diagrams, max_h1_persistence, persistence_norms
+from .utils import white_noise
+
+NULL_DRAWS = 200
+NULL_QUANTILE = 0.95
+
+
+class NullTable:
+    """
+    Null ensemble for one (window, m, tau) at unit noise scale.
+    """
+
+    def __init__(self, window: int, m: int, tau: int, z1: np.ndarray, max_h1: np.ndarray):
+        self.window = window
+        self.m = m
+        self.tau = tau
+        self.z1 = np.sort(np.asarray(z1, dtype=float))
+        self.max_h1 = np.sort(np.asarray(max_h1, dtype=float))
+
+    @property
+    def n_draws(self) -> int:
+        return len(self.z1)
+
+    def quantile(self, metric: str, q: float, scale=1.0):
+        """
+        Null quantile of `metric` ("z1" or "max_h1") for noise of std `scale`.
+
+        Rips diagrams scale linearly with the data, so a unit-scale table
+        serves any scale.
+        """
+        return np.quantile(getattr(self, metric), q) * np.asarray(scale)
+
+    def pvalue(self, metric: str, observed, scale=1.0) -> np.ndarray:
+        """
+        One-sided empirical p-value P(null >= observed), with +1 smoothing.
+        """
+        null = getattr(self, metric)
+        x = np.asarray(observed, dtype=float) / np.asarray(scale, dtype=float)
+        n_ge = len(null) - np.searchsorted(null, x, side="left")
+        return (1.0 + n_ge) / (1.0 + len(null))
+
+
+class NullTableStore:
+    """
+    On-disk collection of NullTables.
+
+    Tables are keyed by (window, m, tau, n_perm, thresh) and built on first
+    use from a seeded ensemble, so results are reproducible and each key is
+    only ever computed once.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        n_draws: int = NULL_DRAWS,
+        seed: int = 0,
+        executor: str = "serial",
+        n_jobs: int | None = None,
+    ):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.n_draws = int(n_draws)
+        self.seed = int(seed)
+        self.executor = executor
+        self.n_jobs = n_jobs
+        self._loaded: dict[tuple, NullTable] = {}
+
+    def _file(self, key: tuple) -> Path:
+        window, m, tau, n_perm, thresh = key
+        name = f"null_w{window}_m{m}_t{tau}_n{self.n_draws}_s{self.seed}"
+        if n_perm is not None:
+            name += f"_p{n_perm}"
+        if np.isfinite(thresh):
+            name += f"_r{thresh:g}"
+        return self.path / f"{name}.npz"
+
+    def get(
+        self,
+        window: int,
+        m: int,
+        tau: int,
+        n_perm: int | None = None,
+        thresh: float = np.inf,
+    ) -> NullTable:
+        """
+        Load (or build and store) the table for one key.
+        """
+        key = (int(window), int(m), int(tau), n_perm, float(thresh))
+        if key not in self._loaded:
+            self.precompute([key])
+        return self._loaded[key]
+
+    def precompute(self, keys: list[tuple]) -> None:
+        """
+        Build every missing table; draws of all keys share one worker pool.
+
+        keys are (window, m, tau) or (window, m, tau, n_perm, thresh).
+        """
+        full = []
+        for window, m, tau, *approx in keys:
+            n_perm, thresh = approx if approx else (None, np.inf)
+            full.append((int(window), int(m), int(tau), n_perm, float(thresh)))
+        keys = full
+
+        missing = []
+        for key in keys:
+            if key in self._loaded:
+                continue
+            f = self._file(key)
+            if f.exists():
+                with np.load(f) as data:
+                    self._loaded[key] = NullTable(*key[:3], data["z1"], data["max_h1"])
+            else:
+                missing.append(key)
+
+        if not missing:
+            return
+
+        n_workers = 1 if self.executor == "serial" else resolve_n_jobs(self.n_jobs)
+        chunk_size = max(1, -(-self.n_draws * len(missing) // (4 * n_workers)))
+
+        tasks = []
+        for key in missing:
+            for draws in chunked(list(range(self.n_draws)), chunk_size):
+                tasks.append((key, self.seed, draws))
+
+        results = run_tasks(_null_draws, tasks, executor=self.executor, n_jobs=self.n_jobs)
+
+        for key in missing:
+            parts = [r for (k, _, _), r in zip(tasks, results) if k == key]
+            z1 = np.concatenate([p[0] for p in parts])
+            max_h1 = np.concatenate([p[1] for p in parts])
+            self._save(key, z1, max_h1)
+            self._loaded[key] = NullTable(*key[:3], z1, max_h1)
+
+    def _save(self, key: tuple, z1: np.ndarray, max_h1: np.ndarray) -> None:
+        f = self._file(key)
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                np.savez(fh, z1=z1, max_h1=max_h1)
+            os.replace(tmp, f)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+
+def _null_draws(key: tuple, seed: int, draws: list[int]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Unit-variance white-noise null metrics for the given draw indices.
+    """
+    window, m, tau, n_perm, thresh = key
+
+    z1 = np.empty(len(draws))
+    max_h1 = np.empty(len(draws))
+
+    for j, draw in enumerate(draws):
+        ss = np.random.SeedSequence([seed, window, m, tau, draw])
+        X = delay_embedding_view(white_noise(window, scale=1.0, seed=ss), m=m, tau=tau)
+
+        dgm1 = compute_diagrams(X, maxdim=1, n_perm=n_perm, thresh=thresh)[1]
+        dgm1 = cap_deaths(dgm1, thresh)
+
+        if dgm1.size == 0:
+            z1[j] = max_h1[j] = 0.0
+        else:
+            z1[j] = persistence_norms(dgm1)[2]
+            max_h1[j] = max_h1_persistence(dgm1)
+
+    return z1, max_h1
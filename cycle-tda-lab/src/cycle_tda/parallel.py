@@ -0,0 +1,90 @@
+# src/cycle_tda/parallel.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+EXECUTORS = ("serial", "process")
+
+
+def resolve_n_jobs(n_jobs: int | None) -> int:
+    """
+    Number of workers for an n_jobs setting.
+
+    None or -1 means all cores, -2 all but one, and so on.
+    """
+    n_cpus = os.cpu_count() or 1
+
+    if n_jobs is None:
+        return n_cpus
+    if n_jobs == 0:
+        raise ValueError("n_jobs must be non-zero")
+    if n_jobs < 0:
+        return max(1, n_cpus + 1 + n_jobs)
+
+    return int(n_jobs)
+
+
+def chunked(items: list, size: int) -> list[list]:
+    """
+    Split a list into consecutive chunks of at most `size` items.
+    """
+    if size < 1:
+        raise ValueError("chunk size must be >= 1")
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def run_tasks(
+    fn,
+    tasks: list[tuple],
+    executor: str = "serial",
+    n_jobs: int | None = None,
+) -> list:
+    """
+    Apply fn(*task) to every task and return results in task order.
+
+    executor="serial" runs in-process; executor="process" spreads tasks
+    over a process pool. `fn` must be a module-level function.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor '{executor}', expected one of {EXECUTORS}")
+
+    n_workers = min(resolve_n_jobs(n_jobs), max(len(tasks), 1))
+
+    if executor == "serial" or n_workers == 1:
+        return [fn(*task) for task in tasks]
+
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        futures = [pool.submit(fn, *task) for task in tasks]
+        return [f.result() for f in futures]
+
+
+def iter_tasks(
+    fn,
+    tasks: list[tuple],
+    executor: str = "serial",
+    n_jobs: int | None = None,
+):
+    """
+    Like run_tasks, but yield (task_index, result) as tasks finish.
+
+    Tasks are submitted in list order, so put the longest first. A task
+    that raises yields its exception object as the result.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor '{executor}', expected one of {EXECUTORS}")
+
+    n_workers = min(resolve_n_jobs(n_jobs), max(len(tasks), 1))
+
+    if executor == "serial" or n_workers == 1:
+        for i, task in enumerate(tasks):
+            try:
+                yield i, fn(*task)
+            except Exception as exc:
+                yield i, exc
+        return
+
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        futures = {pool.submit(fn, *task): i for i, task in enumerate(tasks)}
+        for f in as_completed(futures):
+            exc = f.exception()
+            yield futures[f], (exc if exc is not None else f.result())
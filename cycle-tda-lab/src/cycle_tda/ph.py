@@ -1,15 +1,104 @@
 import numpy as np
 from ripser import ripser
 
+from .cache import DiskCache, hash_key
+
 
 def compute_diagrams(
     X: np.ndarray,
     maxdim: int = 1,
+    cache: DiskCache | None = None,
+    key: str | None = None,
+    distance_matrix: bool = False,
+    n_perm: int | None = None,
+    thresh: float = np.inf,
 ):
     """
     Compute persistence diagrams using Ripser.
+
+    X is a point cloud, or a square distance matrix if distance_matrix=True.
+    With a cache, diagrams are looked up by `key` (default: a hash of X and
+    the Ripser settings) and Ripser only runs on a miss.
+
+    n_perm / thresh select the approximate mode; see
+    compute_diagrams_with_bound.
+    """
+    dgms, _ = compute_diagrams_with_bound(
+        X,
+        maxdim=maxdim,
+        cache=cache,
+        key=key,
+        distance_matrix=distance_matrix,
+        n_perm=n_perm,
+        thresh=thresh,
+    )
+    return dgms
+
+
+def compute_diagrams_with_bound(
+    X: np.ndarray,
+    maxdim: int = 1,
+    cache: DiskCache | None = None,
+    key: str | None = None,
+    distance_matrix: bool = False,
+    n_perm: int | None = None,
+    thresh: float = np.inf,
+) -> tuple[list, float]:
+    """
+    Persistence diagrams plus a bottleneck-distance bound to the exact ones.
+
+    n_perm : int | None
+        Run Ripser on a greedy-permutation subsample of n_perm points.
+        The subsample is within r_cover (Hausdorff) of the full cloud, so
+        its Rips diagrams are within 2 * r_cover (bottleneck) of the exact
+        diagrams; that value is returned as the bound.
+    thresh : float
+        Stop the Rips filtration at this scale. Classes alive at thresh get
+        an infinite death (see cap_deaths); the bound does not cover them.
+
+    Returns
+    -------
+    (dgms, bound)
+        bound is 0.0 for exact computations.
     """
-    return ripser(X, maxdim=maxdim)["dgms"]
+    n_points = X.shape[0]
+    if n_perm is not None and n_perm >= n_points:
+        n_perm = None
+
+    settings = dict(distance_matrix=distance_matrix, n_perm=n_perm, thresh=thresh)
+
+    if cache is not None:
+        if key is None:
+            key = hash_key(X, maxdim=maxdim, **settings)
+
+        hit = cache.get(key)
+        if hit is not None:
+            dgms = [hit[f"dgm{d}"] for d in range(maxdim + 1)]
+            return dgms, float(hit.get("bound", 0.0))
+
+    result = ripser(X, maxdim=maxdim, **settings)
+    dgms = result["dgms"]
+    bound = 2.0 * float(result["r_cover"]) if n_perm is not None else 0.0
+
+    if cache is not None:
+        arrays = {f"dgm{d}": dgm for d, dgm in enumerate(dgms)}
+        cache.put(key, {**arrays, "bound": np.array(bound)})
+
+    return dgms, bound
+
+
+def cap_deaths(dgm: np.ndarray, thresh: float) -> np.ndarray:
+    """
+    Replace infinite deaths by thresh (classes still alive at the cutoff).
+
+    The capped persistence is a lower bound on the true persistence.
+    """
+    if not np.isfinite(thresh) or dgm.size == 0:
+        return dgm
+
+    dgm = dgm.copy()
+    dgm[~np.isfinite(dgm[:, 1]), 1] = thresh
+    return dgm
 
 
 def max_h1_persistence(dgm1: np.ndarray) -> float:
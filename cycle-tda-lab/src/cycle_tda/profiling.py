@@ -0,0 +1,120 @@
+# src/cycle_tda/profiling.py
+
+"""
+Opt-in per-stage timing for rolling_ph.
+
+Pass a PHProfiler as rolling_ph(..., profiler=prof). Workers time each
+window's stages and send the records back with their results, so it
+works under any executor. Without a profiler, no timing is done.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+# per-window stages, in pipeline order
+WINDOW_STAGES = ("distances", "normalize", "ph", "norms", "null")
+
+
+def no_clock() -> float:
+    return 0.0
+
+
+def stage_clock(enabled: bool):
+    """
+    time.perf_counter when profiling, else a constant-zero clock.
+    """
+    return time.perf_counter if enabled else no_clock
+
+
+class PHProfiler:
+    """
+    Collects per-window stage timings across one or more rolling_ph runs.
+
+    Usage
+    -----
+    prof = PHProfiler()
+    rolling_ph(series, 120, m=3, tau=2, profiler=prof)
+    prof.summary()          # total / mean / p95 / share per stage
+    prof.to_frame()         # one row per window
+    prof.slowest(10)        # pathological windows
+    """
+
+    def __init__(self):
+        self.records: list[dict] = []
+        self.run_stages: list[dict] = []
+        self._n_runs = 0
+
+    def start_run(self) -> int:
+        self._n_runs += 1
+        return self._n_runs
+
+    def add_windows(self, records: list[dict]) -> None:
+        self.records.extend(records)
+
+    def add_stage(self, run: int, stage: str, seconds: float, **meta) -> None:
+        """
+        Record a once-per-run stage (e.g. batch window statistics).
+        """
+        self.run_stages.append({"run": run, "stage": stage, "seconds": seconds, **meta})
+
+    def clear(self) -> None:
+        self.records.clear()
+        self.run_stages.clear()
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Per-window timings (seconds) with run, window, m, tau, end_date and
+        n_points, plus a `total` column.
+        """
+        df = pd.DataFrame(self.records)
+        if df.empty:
+            return df
+
+        stages = [s for s in WINDOW_STAGES if s in df.columns]
+        meta = [c for c in ("run", "window", "m", "tau", "end_date", "n_points") if c in df.columns]
+        df = df[meta + stages].copy()
+        df["total"] = df[stages].sum(axis=1)
+        return df
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Per-stage total, mean, p95 and max seconds, count and share of the
+        overall time. Once-per-run stages have count = number of runs.
+        """
+        rows = []
+
+        df = self.to_frame()
+        for stage in WINDOW_STAGES:
+            if stage not in df.columns:
+                continue
+            t = df[stage].to_numpy(dtype=float)
+            rows.append(_stats(stage, t))
+
+        runs = pd.DataFrame(self.run_stages)
+        if not runs.empty:
+            for stage, g in runs.groupby("stage", sort=False):
+                rows.append(_stats(stage, g["seconds"].to_numpy(dtype=float)))
+
+        out = pd.DataFrame(rows).set_index("stage") if rows else pd.DataFrame()
+        if not out.empty:
+            out["share"] = out["total"] / out["total"].sum()
+        return out
+
+    def slowest(self, n: int = 10, stage: str = "total") -> pd.DataFrame:
+        df = self.to_frame()
+        if df.empty:
+            return df
+        return df.nlargest(n, stage)
+
+
+def _stats(stage: str, t: np.ndarray) -> dict:
+    return {
+        "stage": stage,
+        "count": len(t),
+        "total": float(t.sum()),
+        "mean": float(t.mean()),
+        "p95": float(np.quantile(t, 0.95)),
+        "max": float(t.max()),
+    }
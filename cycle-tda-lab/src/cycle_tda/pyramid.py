@@ -0,0 +1,201 @@
+# src/cycle_tda/pyramid.py
+
+"""
+Multi-resolution rolling PH for high-frequency (e.g. daily) series.
+
+The series is aggregated into a pyramid of coarser levels (blocks of
+`factor` samples). The coarsest usable level is scanned over the whole
+history; each finer level is only computed near z1 regime transitions
+found on the level above, and over any user-requested date ranges.
+Window length and delay are given in base samples and rescaled per level.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .rolling import MIN_EMBED_POINTS, _rolling_frame, rolling_ph
+
+PYRAMID_FACTORS = (21, 5, 1)  # ~monthly, ~weekly, daily (trading days)
+AGGREGATIONS = ("last", "mean")
+REFINE_MODES = ("transitions", "none")
+
+
+def decimate(series: pd.Series, factor: int, how: str = "last") -> pd.Series:
+    """
+    Aggregate consecutive blocks of `factor` samples.
+
+    Blocks are aligned to the end of the series (a partial first block is
+    dropped) and stamped with their last date. how="last" keeps the last
+    value (prices / levels), how="mean" averages the block.
+    """
+    if how not in AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation '{how}', expected one of {AGGREGATIONS}")
+    if factor == 1:
+        return series
+
+    n = len(series) // factor * factor
+    s = series.iloc[len(series) - n :]
+    blocks = np.asarray(s.values, dtype=float).reshape(-1, factor)
+
+    values = blocks[:, -1] if how == "last" else blocks.mean(axis=1)
+    return pd.Series(values, index=s.index[factor - 1 :: factor], name=series.name)
+
+
+def rolling_ph_pyramid(
+    series: pd.Series,
+    window: int,
+    stride: int = 1,
+    m: int = 3,
+    tau: int = 1,
+    factors: tuple[int, ...] = PYRAMID_FACTORS,
+    how: str = "last",
+    refine: str = "transitions",
+    refine_ranges: list[tuple] | None = None,
+    margin: int = 3,
+    q_on: float = 0.75,
+    q_off: float = 0.50,
+    normalize: bool = True,
+    executor: str = "serial",
+    n_jobs: int | None = None,
+    chunk_size: int | None = None,
+    **ph_kwargs,
+) -> pd.DataFrame:
+    """
+    Coarse-to-fine rolling PH.
+
+    Parameters
+    ----------
+    window, stride, tau : int
+        In base samples; each level uses round(x / factor) (at least 1)
+    factors : tuple of int
+        Aggregation factors, coarse to fine. Levels whose window would
+        have fewer than MIN_EMBED_POINTS embedded points are skipped.
+    refine : {"transitions", "none"}
+        "transitions": a finer level is computed within `margin` level
+        steps of every change in z1 state (ON >= q_on quantile, OFF <=
+        q_off quantile of that level's own z1) on the level above.
+        "none": only refine_ranges are refined.
+    refine_ranges : list of (start, end), optional
+        Date ranges computed at every finer level
+    **ph_kwargs
+        Per-window options of rolling_ph (include_null, cache, n_perm, ...)
+
+    Returns
+    -------
+    pd.DataFrame
+        rolling_ph rows of all levels, indexed by end date, with a
+        `resolution` column (the level's factor). window and tau are in
+        level samples.
+    """
+    if not isinstance(series, pd.Series):
+        raise TypeError("series must be a pandas Series")
+    if refine not in REFINE_MODES:
+        raise ValueError(f"Unknown refine '{refine}', expected one of {REFINE_MODES}")
+    if list(factors) != sorted(factors, reverse=True):
+        raise ValueError("factors must be ordered coarse to fine")
+
+    series = series.sort_index()
+    ranges = [(pd.Timestamp(a), pd.Timestamp(b)) for a, b in (refine_ranges or [])]
+
+    levels = []
+    for f in factors:
+        w_f = max(1, round(window / f))
+        tau_f = max(1, round(tau / f))
+        if w_f - (m - 1) * tau_f >= MIN_EMBED_POINTS:
+            levels.append((f, w_f, max(1, round(stride / f)), tau_f))
+
+    if not levels:
+        raise ValueError("No pyramid level leaves enough embedded points for this window")
+
+    frames = []
+    regions: list[tuple] = []
+    scanned = False
+
+    for f, w_f, stride_f, tau_f in levels:
+        s = decimate(series, f, how=how)
+        if len(s) < w_f:
+            continue
+        values = np.asarray(s.values, dtype=float)
+        dates = s.index
+
+        # the coarsest level long enough for a window (rounding can make a
+        # coarser one too short) is scanned in full
+        if not scanned:
+            df = rolling_ph(
+                s,
+                w_f,
+                stride_f,
+                m,
+                tau_f,
+                normalize=normalize,
+                executor=executor,
+                n_jobs=n_jobs,
+                chunk_size=chunk_size,
+                **ph_kwargs,
+            )
+            scanned = True
+        else:
+            grid = np.arange(w_f, len(s) + 1, stride_f)
+            end_dates = dates[grid - 1]
+            inside = np.zeros(len(grid), dtype=bool)
+            for a, b in regions + ranges:
+                inside |= (end_dates >= a) & (end_dates <= b)
+
+            df = _rolling_frame(
+                values,
+                dates,
+                list(grid[inside]),
+                window=w_f,
+                m=m,
+                tau=tau_f,
+                normalize=normalize,
+                executor=executor,
+                n_jobs=n_jobs,
+                chunk_size=chunk_size,
+                **ph_kwargs,
+            )
+
+        if len(df) == 0:
+            continue
+
+        df["resolution"] = f
+        frames.append(df)
+
+        if refine == "transitions":
+            regions = _transition_regions(df, dates, stride_f, margin, q_on, q_off)
+
+    if not frames:
+        return pd.DataFrame()
+
+    return pd.concat(frames).sort_index(kind="stable")
+
+
+def _transition_regions(
+    df: pd.DataFrame,
+    dates: pd.Index,
+    stride: int,
+    margin: int,
+    q_on: float,
+    q_off: float,
+) -> list[tuple]:
+    """
+    Date ranges within `margin` steps of a z1 state change between
+    consecutive grid windows of one level.
+
+    ON / OFF thresholds are quantiles of this level's own z1: its scale
+    depends on the number of points per window, i.e. on the resolution.
+    """
+    z1 = df["z1"].to_numpy()
+    hi, lo = df["z1"].quantile(q_on), df["z1"].quantile(q_off)
+    state = np.select([z1 >= hi, z1 <= lo], [1, -1], default=0)
+
+    pos = dates.get_indexer(df.index)
+    adjacent = np.diff(pos) == stride
+    changed = np.flatnonzero(adjacent & (np.diff(state) != 0)) + 1
+
+    regions = []
+    for i in changed:
+        a = max(0, pos[i] - margin * stride)
+        b = min(len(dates) - 1, pos[i] + margin * stride)
+        regions.append((dates[a], dates[b]))
+    return regions
@@ -3,9 +3,22 @@
 import numpy as np
 import pandas as pd
 
-from .embeddings import delay_embedding
-from .ph import compute_diagrams, max_h1_persistence, persistence_norms
-from .utils import white_noise_like
+from .cache import DiskCache, hash_key
+from .diagrams import DiagramStore
+from .distances import DISTANCE_MAX_BYTES, delay_distance_matrix, plan_blocks
+from .embeddings import delay_embedding_view
+from .nulls import NULL_QUANTILE, NullTableStore
+from .parallel import chunked, resolve_n_jobs, run_tasks
+from .ph import (
+    cap_deaths,
+    compute_diagrams,
+    compute_diagrams_with_bound,
+    max_h1_persistence,
+    persistence_norms,
+)
+from .profiling import PHProfiler, stage_clock
+from .utils import white_noise
+from .windows import rolling_window_stats, window_prefix
 
 
 # ============================
@@ -15,6 +28,37 @@ from .utils import white_noise_like
 MIN_EMBED_POINTS = 30   # hard floor for meaningful PH
 EPS = 1e-12
 
+DISTANCE_MODES = ("pointcloud", "global")
+
+# per-window PH options threaded through _rolling_frame
+PH_DEFAULTS = dict(
+    include_null=False,
+    null_seed=None,
+    cache=None,
+    distance_mode="pointcloud",
+    distance_max_bytes=DISTANCE_MAX_BYTES,
+    n_perm=None,
+    thresh=np.inf,
+    null_table=None,
+    profiler=None,
+    diagrams=None,
+)
+
+OUTPUT_COLUMNS = [
+    "start_date",
+    "end_date",
+    "l1",
+    "l2",
+    "z1",
+    "max_h1",
+    "window",
+    "m",
+    "tau",
+    "n_embed_points",
+    "std",
+    "range",
+]
+
 
 def rolling_ph(
     series: pd.Series,
@@ -24,6 +68,19 @@ def rolling_ph(
     tau: int = 1,
     normalize: bool = True,
     include_null: bool = False,
+    executor: str = "serial",
+    n_jobs: int | None = None,
+    chunk_size: int | None = None,
+    null_seed: int | None = None,
+    cache: DiskCache | None = None,
+    distance_mode: str = "pointcloud",
+    distance_max_bytes: int = DISTANCE_MAX_BYTES,
+    n_perm: int | None = None,
+    thresh: float = np.inf,
+    null_table: NullTableStore | None = None,
+    profiler: PHProfiler | None = None,
+    diagrams: DiagramStore | None = None,
+    schedule: pd.DataFrame | None = None,
 ) -> pd.DataFrame:
     """
     Rolling persistent homology over a 1D time series.
@@ -47,11 +104,65 @@ def rolling_ph(
         Whether to z-score each window before embedding
     include_null : bool
         Whether to compute PH on a white-noise null model
+    executor : str
+        "serial" (default) or "process" to spread windows over a process pool
+    n_jobs : int | None
+        Number of worker processes for executor="process" (None = all cores)
+    chunk_size : int | None
+        Windows per task sent to a worker (None = ~4 chunks per worker)
+    null_seed : int | None
+        Seed for the null model; each window draws from (null_seed, end),
+        so seeded nulls are reproducible under any executor
+    cache : DiskCache | None
+        Persistent diagram cache keyed by window values, m, tau, normalize
+        and maxdim; overlapping runs (e.g. eras) reuse stored diagrams
+    distance_mode : str
+        "pointcloud" (default): Ripser builds distances per window.
+        "global": embedded-point distances are computed once for runs of
+        overlapping windows and each window's submatrix is passed to Ripser
+        as a precomputed distance matrix
+    distance_max_bytes : int
+        Memory cap for one shared distance block in "global" mode; longer
+        series are processed blockwise
+    n_perm : int | None
+        Approximate mode: PH on a greedy-permutation subsample of n_perm
+        embedded points per window
+    thresh : float
+        Approximate mode: stop the Rips filtration at this scale (in
+        z-scored units when normalize=True); H1 classes still alive are
+        capped at thresh
+
+    With n_perm or a finite thresh, the output gains `approx_bound`
+    (bottleneck bound to the exact diagrams, 2 * covering radius) and
+    `n_h1_truncated` (H1 classes cut off by thresh) per window. Greedy
+    subsampling has a fixed per-window overhead and only pays off for
+    windows well above ~100 embedded points; see
+    scripts/benchmark_approx_ph.py.
+
+    With null_table (a NullTableStore), a precomputed seeded white-noise
+    ensemble for (window, m, tau) is looked up instead of drawing one null
+    per window. The output gains z1_null / max_h1_null (ensemble medians),
+    their 95% quantiles (*_null_q95) and one-sided p-values (z1_pvalue,
+    max_h1_pvalue); include_null is then ignored.
+
+    With profiler (a PHProfiler), per-window stage durations (distances,
+    normalize, ph, norms, null) and point counts are recorded into it.
+
+    With diagrams (a DiagramStore), every window's H0/H1 diagrams (before
+    any thresh capping) are kept in it, in output row order.
+
+    With schedule (a frame indexed by window end date with `m` and `tau`
+    columns, e.g. from selection.rolling_embedding_params), each window is
+    embedded with its own (m, tau) and the m / tau arguments are ignored.
+    Windows are computed in one batch per distinct (m, tau); windows whose
+    end date is missing from the schedule are skipped. Stored diagrams
+    then follow that batch order (their index carries m and tau).
 
     Returns
     -------
     pd.DataFrame
-        Indexed by window end date, with PH metrics and metadata
+        Indexed by window end date, with PH metrics and metadata.
+        Row order and values do not depend on the executor.
     """
 
     # ----------------------------
@@ -67,106 +178,581 @@ def rolling_ph(
     if len(values) < window:
         raise ValueError("Series shorter than rolling window")
 
-    min_embed = (m - 1) * tau + 1
-    if window < min_embed:
+    if null_table is not None and not normalize and np.isfinite(thresh):
+        raise ValueError("null_table with a finite thresh requires normalize=True")
+
+    if distance_mode not in DISTANCE_MODES:
+        raise ValueError(
+            f"Unknown distance_mode '{distance_mode}', expected one of {DISTANCE_MODES}"
+        )
+
+    ends = list(range(window, len(values) + 1, stride))
+
+    if schedule is not None:
+        pairs = _schedule_pairs(schedule, dates, ends)
+    else:
+        pairs = {(m, tau): ends}
+
+    for m, tau in pairs:
+        min_embed = (m - 1) * tau + 1
+        if window < min_embed:
+            raise ValueError(
+                f"Window {window} < embedding requirement {min_embed} (m={m}, tau={tau})"
+            )
+
+    opts = dict(
+        include_null=include_null,
+        null_seed=null_seed,
+        cache=cache,
+        distance_mode=distance_mode,
+        distance_max_bytes=distance_max_bytes,
+        n_perm=n_perm,
+        thresh=thresh,
+        null_table=null_table,
+        profiler=profiler,
+        diagrams=diagrams,
+    )
+
+    frames = [
+        _rolling_frame(
+            values,
+            dates,
+            pair_ends,
+            window=window,
+            m=m,
+            tau=tau,
+            normalize=normalize,
+            executor=executor,
+            n_jobs=n_jobs,
+            chunk_size=chunk_size,
+            **opts,
+        )
+        for (m, tau), pair_ends in pairs.items()
+    ]
+
+    if len(frames) == 1:
+        return frames[0]
+
+    frames = [f for f in frames if len(f)]
+    if not frames:
+        return pd.DataFrame(columns=OUTPUT_COLUMNS)
+    return pd.concat(frames).sort_index(kind="stable")
+
+
+def _schedule_pairs(
+    schedule: pd.DataFrame,
+    dates: pd.Index,
+    ends: list[int],
+) -> dict[tuple[int, int], list[int]]:
+    """
+    Group window ends by the (m, tau) the schedule gives their end date.
+    """
+    missing = {"m", "tau"} - set(schedule.columns)
+    if missing:
+        raise ValueError(f"schedule is missing columns {sorted(missing)}")
+
+    ends = np.asarray(ends, dtype=np.int64)
+    plan = schedule[["m", "tau"]].reindex(dates[ends - 1])
+    ok = plan.notna().all(axis=1).to_numpy()
+    plan = plan[ok].astype(np.int64)
+
+    groups = plan.groupby(["m", "tau"], sort=True).indices
+    return {(int(m), int(tau)): list(ends[ok][idx]) for (m, tau), idx in groups.items()}
+
+
+def rolling_ph_multi(
+    series: pd.Series,
+    windows: list[int],
+    stride: int = 1,
+    m: int = 3,
+    tau: int = 1,
+    normalize: bool = True,
+    executor: str = "serial",
+    n_jobs: int | None = None,
+    chunk_size: int | None = None,
+    **ph_kwargs,
+) -> pd.DataFrame:
+    """
+    rolling_ph at several window lengths over one series, computed together.
+
+    Running window statistics and the embedding view are built once, and
+    windows of all lengths are scheduled as one start-ordered task list, so
+    with distance_mode="global" they also share distance blocks. Each
+    window's rows equal rolling_ph(series, window, ...).
+
+    Parameters
+    ----------
+    windows : list of int
+        Window lengths (duplicates are computed once)
+    **ph_kwargs
+        Remaining rolling_ph options (include_null, cache, distance_mode,
+        n_perm, thresh, null_table, profiler, ...)
+
+    Returns
+    -------
+    pd.DataFrame
+        Long format, indexed by (window, end_date), with the rolling_ph
+        columns other than window.
+    """
+    if not isinstance(series, pd.Series):
+        raise TypeError("series must be a pandas Series")
+
+    series = series.sort_index()
+    values = np.asarray(series.values, dtype=float)
+    windows = sorted(set(int(w) for w in windows))
+
+    if ph_kwargs.get("null_table") is not None and not normalize and np.isfinite(
+        ph_kwargs.get("thresh", np.inf)
+    ):
+        raise ValueError("null_table with a finite thresh requires normalize=True")
+
+    if ph_kwargs.get("distance_mode", "pointcloud") not in DISTANCE_MODES:
         raise ValueError(
-            f"Window {window} < embedding requirement {min_embed} (m={m}, tau={tau})"
+            f"Unknown distance_mode '{ph_kwargs['distance_mode']}', expected one of {DISTANCE_MODES}"
+        )
+
+    min_embed = (m - 1) * tau + 1
+    for window in windows:
+        if len(values) < window:
+            raise ValueError(f"Series shorter than rolling window {window}")
+        if window < min_embed:
+            raise ValueError(
+                f"Window {window} < embedding requirement {min_embed} (m={m}, tau={tau})"
+            )
+
+    frames = _rolling_frames(
+        values,
+        series.index,
+        {w: list(range(w, len(values) + 1, stride)) for w in windows},
+        m=m,
+        tau=tau,
+        normalize=normalize,
+        executor=executor,
+        n_jobs=n_jobs,
+        chunk_size=chunk_size,
+        **ph_kwargs,
+    )
+
+    # windows too short for MIN_EMBED_POINTS give empty frames (end_date
+    # as a column, not the index), which concat would carry over
+    windows = [w for w in windows if len(frames[w])]
+    if not windows:
+        columns = [c for c in OUTPUT_COLUMNS if c not in ("end_date", "window")]
+        index = pd.MultiIndex.from_arrays([[], []], names=["window", "end_date"])
+        return pd.DataFrame(columns=columns, index=index)
+
+    out = pd.concat(
+        [frames[w].drop(columns="window") for w in windows],
+        keys=windows,
+        names=["window", "end_date"],
+    )
+    return out
+
+
+def _rolling_frame(
+    values: np.ndarray,
+    dates: pd.Index,
+    ends: list[int],
+    window: int,
+    m: int,
+    tau: int,
+    normalize: bool,
+    executor: str,
+    n_jobs: int | None,
+    chunk_size: int | None,
+    **opts,
+) -> pd.DataFrame:
+    """
+    Compute the windows ending at `ends` (exclusive positions into values)
+    and assemble the rolling_ph output frame.
+
+    `opts` are the per-window PH options of rolling_ph (see PH_DEFAULTS);
+    missing ones take the rolling_ph defaults.
+    """
+    frames = _rolling_frames(
+        values,
+        dates,
+        {window: ends},
+        m=m,
+        tau=tau,
+        normalize=normalize,
+        executor=executor,
+        n_jobs=n_jobs,
+        chunk_size=chunk_size,
+        **opts,
+    )
+    return frames[window]
+
+
+def _rolling_frames(
+    values: np.ndarray,
+    dates: pd.Index,
+    ends_by_window: dict[int, list[int]],
+    m: int,
+    tau: int,
+    normalize: bool,
+    executor: str,
+    n_jobs: int | None,
+    chunk_size: int | None,
+    **opts,
+) -> dict[int, pd.DataFrame]:
+    """
+    _rolling_frame for several window lengths over the same series.
+
+    Running sums, the embedding view and (in "global" distance mode)
+    distance blocks are shared: windows of all lengths are ordered by
+    start and scheduled as one task list.
+    """
+    opts = {**PH_DEFAULTS, **opts}
+    cache = opts["cache"]
+    null_table = opts.pop("null_table")
+    if null_table is not None:
+        opts["include_null"] = False
+
+    profiler = opts.pop("profiler")
+    opts["profile"] = profiler is not None
+    clock = stage_clock(opts["profile"])
+    run = profiler.start_run() if profiler is not None else None
+
+    diagrams = opts.pop("diagrams")
+    opts["keep_diagrams"] = diagrams is not None
+
+    # ----------------------------
+    # Batch preprocessing (all windows at once)
+    # ----------------------------
+    prefix = None
+    parts = []  # per window: ends, means, stds, ranges
+    for window, ends in ends_by_window.items():
+        ends = np.asarray(ends, dtype=np.int64)
+        n_points = window - (m - 1) * tau
+
+        if len(ends) == 0 or n_points < MIN_EMBED_POINTS:
+            parts.append((window, ends[:0], *(np.empty(0),) * 3))
+            continue
+
+        t0 = clock()
+        if prefix is None:
+            prefix = window_prefix(values)
+        stats = rolling_window_stats(values, window, ends, prefix=prefix)
+        if profiler is not None:
+            profiler.add_stage(run, "window_stats", clock() - t0, window=window, n_windows=len(ends))
+
+        keep = stats["finite"]
+        if normalize:
+            keep &= (stats["std"] >= EPS) & (stats["range"] > 0)
+
+        parts.append((window, ends[keep], stats["mean"][keep], stats["std"][keep], stats["range"][keep]))
+
+    windows = np.concatenate([np.full(len(p[1]), p[0], dtype=np.int64) for p in parts])
+    ends = np.concatenate([p[1] for p in parts])
+    means = np.concatenate([p[2] for p in parts])
+    stds = np.concatenate([p[3] for p in parts])
+
+    # ----------------------------
+    # Rolling loop (chunked, in start order)
+    # ----------------------------
+    order = np.lexsort((windows, ends - windows))
+
+    n_workers = 1 if executor == "serial" else resolve_n_jobs(n_jobs)
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(order) // (4 * n_workers)))
+
+    tasks = []
+    for sl in chunked(list(order), chunk_size):
+        sl = np.asarray(sl)
+        lo = int((ends[sl] - windows[sl]).min())
+        hi = int(ends[sl].max())
+        tasks.append(
+            (
+                values[lo:hi],
+                lo,
+                ends[sl],
+                means[sl],
+                stds[sl],
+                windows[sl],
+                m,
+                tau,
+                normalize,
+                opts,
+            )
         )
 
-    records = []
+    metrics = [None] * len(order)
+    timings = [None] * len(order)
+    done = 0
+    for chunk_metrics, cache_stats, chunk_timings in run_tasks(
+        _rolling_chunk, tasks, executor=executor, n_jobs=n_jobs
+    ):
+        if cache is not None:
+            cache.merge_stats(cache_stats)
+        idx = order[done : done + len(chunk_metrics)]
+        for j, k in enumerate(idx):
+            metrics[k] = chunk_metrics[j]
+            if chunk_timings:
+                timings[k] = chunk_timings[j]
+        done += len(chunk_metrics)
+
+    if profiler is not None:
+        for end, window, rec in zip(ends, windows, timings):
+            rec.update(run=run, window=int(window), m=m, tau=tau, end_date=dates[end - 1])
+        profiler.add_windows(timings)
+
+    if diagrams is not None:
+        dgm_run = diagrams.start_run()
+        diagrams.add(
+            [
+                {"run": dgm_run, "window": int(w), "m": m, "tau": tau, "end_date": dates[e - 1]}
+                for w, e in zip(windows, ends)
+            ],
+            [row.pop("dgms") for row in metrics],
+        )
 
     # ----------------------------
-    # Rolling loop
+    # One frame per window
     # ----------------------------
-    for end in range(window, len(values) + 1, stride):
-        yw = values[end - window : end]
+    frames = {}
+    offset = 0
+    for window, w_ends, _, w_stds, w_ranges in parts:
+        w_metrics = metrics[offset : offset + len(w_ends)]
+        offset += len(w_ends)
 
-        if not np.all(np.isfinite(yw)):
+        if len(w_ends) == 0:
+            frames[window] = pd.DataFrame(columns=OUTPUT_COLUMNS)
             continue
 
-        # Embedded point count check
         n_points = window - (m - 1) * tau
-        if n_points < MIN_EMBED_POINTS:
-            continue
+        records = []
+        for end, std, rng, row in zip(w_ends, w_stds, w_ranges, w_metrics):
+            records.append(
+                {
+                    "start_date": dates[end - window],
+                    "end_date": dates[end - 1],
+                    "l1": row["l1"],
+                    "l2": row["l2"],
+                    "z1": row["z1"],
+                    "max_h1": row["max_h1"],
+                    "window": window,
+                    "m": m,
+                    "tau": tau,
+                    "n_embed_points": n_points,
+                    "std": float(std),
+                    "range": float(rng),
+                    **row["approx"],
+                    **row["null"],
+                }
+            )
 
-        # ----------------------------
-        # Normalization (explicit)
-        # ----------------------------
-        if normalize:
-            std = np.std(yw, ddof=0)
-            if std < EPS:
-                continue
-            yw_proc = (yw - yw.mean()) / std
-        else:
-            yw_proc = yw
+        out = pd.DataFrame(records).set_index("end_date")
 
         # ----------------------------
-        # Delay embedding
+        # Tabulated null model
         # ----------------------------
-        X = delay_embedding(yw_proc, m=m, tau=tau)
+        if null_table is not None:
+            t0 = clock()
+            table = null_table.get(window, m, tau, n_perm=opts["n_perm"], thresh=opts["thresh"])
+            scale = 1.0 if normalize else w_stds
 
-        # ----------------------------
-        # Persistent homology
-        # ----------------------------
-        dgms = compute_diagrams(X, maxdim=1)
-        dgm1 = dgms[1]
-
-        if dgm1.size == 0:
-            l1 = l2 = z1 = max_h1 = 0.0
-        else:
-            l1, l2, z1 = persistence_norms(dgm1)
-            max_h1 = max_h1_persistence(dgm1)
-
-        row = {
-            "start_date": dates[end - window],
-            "end_date": dates[end - 1],
-            "l1": float(l1),
-            "l2": float(l2),
-            "z1": float(z1),
-            "max_h1": float(max_h1),
-            "window": window,
-            "m": m,
-            "tau": tau,
-            "n_embed_points": n_points,
-            "std": float(np.std(yw)),
-            "range": float(np.ptp(yw)),
-        }
+            for metric in ("z1", "max_h1"):
+                out[f"{metric}_null"] = table.quantile(metric, 0.5, scale)
+                out[f"{metric}_null_q95"] = table.quantile(metric, NULL_QUANTILE, scale)
+            for metric in ("z1", "max_h1"):
+                out[f"{metric}_pvalue"] = table.pvalue(metric, out[metric].values, scale)
+
+            if profiler is not None:
+                profiler.add_stage(run, "null_table", clock() - t0, window=window)
+
+        frames[window] = out
+
+    return frames
+
+
+def _rolling_chunk(
+    values: np.ndarray,
+    offset: int,
+    ends: np.ndarray,
+    means: np.ndarray,
+    stds: np.ndarray,
+    windows: np.ndarray,
+    m: int,
+    tau: int,
+    normalize: bool,
+    opts: dict,
+) -> tuple[list[dict], dict, list[dict]]:
+    """
+    PH metrics for a batch of pre-screened windows.
+
+    `values` holds the samples from `offset` onwards; `ends` are absolute
+    (exclusive) window end positions with their window length and
+    precomputed mean and std, ordered by start. Embeddings are read-only
+    views into `values`; only the z-scored point cloud of the current
+    window is materialized. In "global" distance mode, windows (of any
+    length) share blocks of precomputed distances instead.
+    Also returns the cache counters accumulated by this batch and, if
+    opts["profile"], per-window stage timings (else an empty list).
+    """
+    opts = dict(opts)
+    if opts["cache"] is not None:
+        opts["cache"] = opts["cache"].fork()
+
+    profile = opts["profile"]
+    clock = stage_clock(profile)
+    timings = []
+
+    n_points = windows - (m - 1) * tau
+    starts = ends - windows - offset
+    E = delay_embedding_view(values, m=m, tau=tau)
 
+    if opts["distance_mode"] == "global":
+        blocks = plan_blocks(starts, n_points, m, tau, opts["distance_max_bytes"])
+    else:
+        blocks = [(0, len(ends))]
+
+    out = []
+    for i0, i1 in blocks:
         # ----------------------------
-        # Optional null model
+        # Shared distances for this block of windows
         # ----------------------------
-        if include_null:
-            yw_null = white_noise_like(yw_proc)
-            Xn = delay_embedding(yw_null, m=m, tau=tau)
-            dgms_n = compute_diagrams(Xn, maxdim=1)
-            dgm1_n = dgms_n[1]
-
-            if dgm1_n.size == 0:
-                row["z1_null"] = 0.0
-                row["max_h1_null"] = 0.0
+        D = None
+        p0 = int(starts[i0])
+        t0 = clock()
+        if opts["distance_mode"] == "global":
+            p1 = int((starts[i0:i1] + n_points[i0:i1]).max())
+            D = delay_distance_matrix(values, m, tau, p0, p1)
+        # block cost is spread evenly over its windows
+        t_dist = (clock() - t0) / (i1 - i0)
+
+        for i in range(i0, i1):
+            s = int(starts[i])
+            window = int(windows[i])
+            n = int(n_points[i])
+            t0 = clock()
+
+            # ----------------------------
+            # Point cloud / distance submatrix (+ normalization)
+            # ----------------------------
+            if D is not None:
+                a = s - p0
+                X = D[a : a + n, a : a + n]
+                if normalize:
+                    X = X / stds[i]
             else:
-                _, _, z1n = persistence_norms(dgm1_n)
-                row["z1_null"] = float(z1n)
-                row["max_h1_null"] = float(max_h1_persistence(dgm1_n))
-
-        records.append(row)
-
-    if not records:
-        return pd.DataFrame(
-            columns=[
-                "start_date",
-                "end_date",
-                "l1",
-                "l2",
-                "z1",
-                "max_h1",
-                "window",
-                "m",
-                "tau",
-                "n_embed_points",
-                "std",
-                "range",
-            ]
-        )
+                X = E[s : s + n]
+                if normalize:
+                    X = (X - means[i]) / stds[i]
+            t_norm = clock() - t0
+
+            row = _window_ph(
+                X,
+                values[s : s + window],
+                int(ends[i]),
+                float(stds[i]),
+                window,
+                m,
+                tau,
+                normalize,
+                distance_matrix=D is not None,
+                **opts,
+            )
+            if profile:
+                timings.append(
+                    {
+                        "n_points": n,
+                        "distances": t_dist,
+                        "normalize": t_norm,
+                        **row.pop("timing"),
+                    }
+                )
+            out.append(row)
+
+    cache = opts["cache"]
+    return out, ({} if cache is None else cache.counters()), timings
+
+
+def _window_ph(
+    X: np.ndarray,
+    yw: np.ndarray,
+    end: int,
+    std: float,
+    window: int,
+    m: int,
+    tau: int,
+    normalize: bool,
+    distance_matrix: bool,
+    include_null: bool,
+    null_seed: int | None,
+    cache: DiskCache | None,
+    n_perm: int | None,
+    thresh: float,
+    profile: bool = False,
+    keep_diagrams: bool = False,
+    **_,
+) -> dict:
+    """
+    PH metrics (and optional null) for one prepared window.
+
+    X is the window's point cloud, or its distance matrix if
+    distance_matrix is True; yw are the raw window values (cache key).
+    With profile, row["timing"] holds the ph / norms / null durations;
+    with keep_diagrams, row["dgms"] holds the float32 diagrams.
+    """
+    clock = stage_clock(profile)
+
+    # ----------------------------
+    # Persistent homology
+    # ----------------------------
+    approx = dict(n_perm=n_perm, thresh=thresh)
+
+    t0 = clock()
+    key = None
+    if cache is not None:
+        key = hash_key(yw, m=m, tau=tau, normalize=normalize, maxdim=1, **approx)
+
+    dgms, bound = compute_diagrams_with_bound(
+        X, maxdim=1, cache=cache, key=key, distance_matrix=distance_matrix, **approx
+    )
+    dgm1 = dgms[1]
+    t1 = clock()
+    if keep_diagrams:
+        row_dgms = [np.asarray(dg, dtype=np.float32) for dg in dgms]
+    row = _h1_metrics(cap_deaths(dgm1, thresh))
+    t2 = clock()
+
+    row["approx"] = {}
+    if n_perm is not None or np.isfinite(thresh):
+        row["approx"] = {
+            "approx_bound": bound,
+            "n_h1_truncated": int(np.sum(~np.isfinite(dgm1[:, 1]))) if dgm1.size else 0,
+        }
+
+    # ----------------------------
+    # Optional null model
+    # ----------------------------
+    row["null"] = {}
+    if include_null:
+        seed = None if null_seed is None else np.random.SeedSequence([null_seed, end])
+        scale = 1.0 if normalize else std
+        y_null = white_noise(window, scale=scale, seed=seed)
+
+        Xn = delay_embedding_view(y_null, m=m, tau=tau)
+        null = _h1_metrics(cap_deaths(compute_diagrams(Xn, maxdim=1, **approx)[1], thresh))
+        row["null"] = {"z1_null": null["z1"], "max_h1_null": null["max_h1"]}
+
+    if profile:
+        row["timing"] = {"ph": t1 - t0, "norms": t2 - t1, "null": clock() - t2}
+    if keep_diagrams:
+        row["dgms"] = row_dgms
+
+    return row
+
+
+def _h1_metrics(dgm1: np.ndarray) -> dict:
+    """
+    Norms and maximum persistence of an H1 diagram.
+    """
+    if dgm1.size == 0:
+        l1 = l2 = z1 = max_h1 = 0.0
+    else:
+        l1, l2, z1 = persistence_norms(dgm1)
+        max_h1 = max_h1_persistence(dgm1)
 
-    return pd.DataFrame(records).set_index("end_date")
+    return {"l1": float(l1), "l2": float(l2), "z1": float(z1), "max_h1": float(max_h1)}
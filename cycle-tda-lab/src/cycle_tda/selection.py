@@ -1,44 +1,97 @@
 # src/cycle_tda/selection.py
 
+from collections import OrderedDict
+
 import numpy as np
+import pandas as pd
 from sklearn.neighbors import NearestNeighbors
 
+from .cache import DiskCache, hash_key
+from .embeddings import delay_embedding_view
+
+
+AMI_BLOCK_ELEMS = 2**22  # pair codes materialized per batch of delays
+SELECTION_MEMO_SIZE = 256  # in-process select_embedding_params results kept
+
 
-def ami_tau(y: np.ndarray, max_tau: int = 60, bins: int = 32) -> np.ndarray:
+def ami_tau(
+    y: np.ndarray,
+    max_tau: int = 60,
+    bins: int = 32,
+    edges: np.ndarray | None = None,
+) -> np.ndarray:
     """
     Average Mutual Information for delays 1..max_tau.
+
+    Joint histograms for a batch of delays are filled with a single
+    bincount, and MI is evaluated array-wide for all delays at once.
+    Bin edges default to `bins` equal-width bins over the data's range.
     """
     y = np.asarray(y)
     y = y[np.isfinite(y)]
 
-    hist, edges = np.histogram(y, bins=bins)
+    if edges is None:
+        hist, edges = np.histogram(y, bins=bins)
+    x = _bin_codes(y, edges)
+    bins = len(edges) - 1
+
+    joint = _joint_counts(x, max_tau, bins)
+    return _mutual_information(joint)
+
+
+def _bin_codes(y: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    bins = len(edges) - 1
     x = np.digitize(y, edges[:-1]) - 1
-    x = np.clip(x, 0, bins - 1)
+    return np.clip(x, 0, bins - 1)
+
+
+def _joint_counts(x: np.ndarray, max_tau: int, bins: int) -> np.ndarray:
+    """
+    Joint bin counts of (x[t], x[t + tau]) for tau = 1..max_tau.
+
+    Returns an array of shape (max_tau, bins, bins).
+    """
+    n = len(x)
+    n_cells = bins * bins
+    counts = np.zeros((max_tau, n_cells), dtype=float)
+
+    if n < 2:
+        return counts.reshape(max_tau, bins, bins)
+
+    # Delayed codes past the end of the series hit a sentinel cell.
+    sentinel = bins
+    xp = np.concatenate([x, np.full(max_tau, sentinel)]).astype(np.int64)
+    lead = x[: n - 1].astype(np.int64) * (bins + 1)
+    pos = np.arange(n - 1)
+
+    batch = max(1, AMI_BLOCK_ELEMS // (n - 1))
+    stride = (bins + 1) * (bins + 1)
 
-    ami = np.zeros(max_tau)
+    for t0 in range(1, max_tau + 1, batch):
+        taus = np.arange(t0, min(t0 + batch, max_tau + 1))
+        codes = lead[None, :] + xp[pos[None, :] + taus[:, None]]
+        codes += (np.arange(len(taus)) * stride)[:, None]
 
-    for tau in range(1, max_tau + 1):
-        x1 = x[:-tau]
-        x2 = x[tau:]
+        c = np.bincount(codes.ravel(), minlength=len(taus) * stride)
+        c = c.reshape(len(taus), bins + 1, bins + 1)[:, :bins, :bins]
+        counts[taus - 1] = c.reshape(len(taus), n_cells)
 
-        joint = np.zeros((bins, bins))
-        for i in range(len(x1)):
-            joint[x1[i], x2[i]] += 1
+    return counts.reshape(max_tau, bins, bins)
 
-        joint /= joint.sum()
 
-        px = joint.sum(axis=1)
-        py = joint.sum(axis=0)
+def _mutual_information(joint: np.ndarray) -> np.ndarray:
+    """
+    Mutual information (nats) for a stack of joint count tables.
+    """
+    joint = joint / joint.sum(axis=(1, 2), keepdims=True)
 
-        mi = 0.0
-        for i in range(bins):
-            for j in range(bins):
-                if joint[i, j] > 0:
-                    mi += joint[i, j] * np.log(joint[i, j] / (px[i] * py[j]))
+    px = joint.sum(axis=2)
+    py = joint.sum(axis=1)
 
-        ami[tau - 1] = mi
+    denom = px[:, :, None] * py[:, None, :]
+    ratio = np.divide(joint, denom, out=np.ones_like(joint), where=joint > 0)
 
-    return ami
+    return (joint * np.log(ratio)).sum(axis=(1, 2))
 
 
 def first_local_minimum(arr: np.ndarray) -> int | None:
@@ -51,66 +104,309 @@ def first_local_minimum(arr: np.ndarray) -> int | None:
     return None
 
 
+FNN_DENSE_MAX_BYTES = 32 * 1024**2  # shared distance matrices; KD-trees win beyond ~1.5k points
+FNN_TREE_CANDIDATES = 4  # KD-tree neighbours fetched per point to find distance ties
+FNN_TIE_BLOCK = 256  # distance-matrix rows scanned for ties at once
+
+
 def fnn_percent(
     y: np.ndarray,
     tau: int,
     m_max: int = 12,
     rtol: float = 10.0,
+    stop_below: float | None = None,
 ) -> np.ndarray:
     """
     False nearest neighbors % for m=1..m_max at fixed tau.
+
+    If stop_below is given, the scan stops at the first m whose FNN % falls
+    below it; later entries are NaN.
     """
-    y = np.asarray(y)
+    return fnn_scan(y, [tau], m_max=m_max, rtol=rtol, stop_below=stop_below)[0]
+
+
+def fnn_scan(
+    y: np.ndarray,
+    taus: list[int],
+    m_max: int = 12,
+    rtol: float = 10.0,
+    stop_below: float | None = None,
+    max_dense_bytes: int = FNN_DENSE_MAX_BYTES,
+) -> np.ndarray:
+    """
+    False nearest neighbors % for m=1..m_max, for several delays at once.
+
+    Embeddings are strided views of y. When the pairwise distance matrices
+    fit in max_dense_bytes, one matrix of squared sample differences is
+    shared by all delays, and squared embedding distances are accumulated
+    one coordinate at a time, so moving from m to m+1 costs a single
+    matrix addition. Longer series fall back to a KD-tree per m.
+
+    Both engines split ties the same way: a point whose nearest distance
+    is shared by several neighbours counts as the share of them that are
+    false. At distance 0 the point itself is one of them (a k-NN query of
+    the training set may return it or any duplicate), so quantized series
+    give the same FNN % whichever engine runs.
+
+    Returns
+    -------
+    np.ndarray
+        Shape (len(taus), m_max); NaN where the embedding is too short or
+        the scan stopped early.
+    """
+    y = np.asarray(y, dtype=float)
     y = y[np.isfinite(y)]
     N = len(y)
 
-    def embed(m):
-        n_points = N - (m - 1) * tau
-        if n_points <= 2:
-            return None
-        return np.column_stack(
-            [y[i:i + n_points] for i in range(0, m * tau, tau)]
-        )
+    out = np.full((len(taus), m_max), np.nan)
+    dense = 2 * N * N * 8 <= max_dense_bytes
+
+    sqdiff = None
+    if dense and N > 0:
+        sqdiff = (y[:, None] - y[None, :]) ** 2
+
+    for row, tau in enumerate(taus):
+        if dense:
+            out[row] = _fnn_dense(y, sqdiff, tau, m_max, rtol, stop_below)
+        else:
+            out[row] = _fnn_tree(y, tau, m_max, rtol, stop_below)
+
+    return out
+
+
+def _duplicate_share(X: np.ndarray, nxt: np.ndarray) -> np.ndarray:
+    """
+    Share of false neighbours among each point's zero-distance neighbours,
+    the point itself included (rows must hold every member of their
+    duplicate groups).
+
+    A k-NN query of the training set cannot tell a point from its
+    duplicates, so all of them are equally likely to be returned; the
+    point itself is never false, each duplicate with a different next
+    value always is.
+    """
+    X = X + 0.0  # -0.0 -> 0.0 before comparing bytes
+    _, g = np.unique(X, axis=0, return_inverse=True)
+    _, gv = np.unique(np.column_stack([X, nxt + 0.0]), axis=0, return_inverse=True)
+    g, gv = g.ravel(), gv.ravel()
+
+    size = np.bincount(g)[g]
+    return (size - np.bincount(gv)[gv]) / size
+
+
+def _tie_share(nxt, i, j, d2, rtol, n) -> np.ndarray:
+    """
+    Share of false neighbours among nearest neighbours, from pairs (i, j)
+    at squared distance d2 (> 0); rows without pairs are NaN.
+    """
+    false = (np.abs(nxt[i] - nxt[j]) / (np.sqrt(d2) + 1e-12)) > rtol
+    with np.errstate(invalid="ignore"):
+        return np.bincount(i, weights=false, minlength=n) / np.bincount(i, minlength=n)
+
+
+def _embedded_d2(y, tau, m, i, j) -> np.ndarray:
+    """
+    Squared distances between delay vectors i and j (broadcast), summed
+    one coordinate at a time like _fnn_dense.
+    """
+    d2 = (y[i] - y[j]) ** 2
+    for k in range(1, m):
+        d2 = d2 + (y[i + k * tau] - y[j + k * tau]) ** 2
+    return d2
 
-    out = np.zeros(m_max, dtype=float)
+
+def _fnn_dense(y, sqdiff, tau, m_max, rtol, stop_below):
+    """
+    FNN scan for one delay using incrementally accumulated distances.
+    """
+    N = len(y)
+    out = np.full(m_max, np.nan)
+
+    # points usable at dimension m need an (m+1)-th coordinate
+    L1 = N - tau
+    if L1 <= 2:
+        return out
+
+    D2 = np.zeros((L1, L1))
+    np.fill_diagonal(D2, np.inf)
 
     for m in range(1, m_max + 1):
-        X = embed(m)
-        Xp = embed(m + 1)
-        if X is None or Xp is None:
-            out[m - 1] = np.nan
-            continue
+        L = N - m * tau
+        if L <= 2:
+            break
+
+        k = (m - 1) * tau
+        D2[:L, :L] += sqdiff[k : k + L, k : k + L]
+
+        # nearest and second-nearest distance (ties show up as equal)
+        sub = D2[:L, :L]
+        rows = np.arange(L)
+        nn_idx = np.argmin(sub, axis=1)
+        best = sub[rows, nn_idx]
+        sub[rows, nn_idx] = np.inf
+        second = sub.min(axis=1)
+        sub[rows, nn_idx] = best
+
+        nxt = y[m * tau : m * tau + L]
+        share = _tie_share(nxt, rows, nn_idx, best, rtol, L)
 
-        L = min(len(X), len(Xp))
-        X = X[:L]
-        Xp = Xp[:L]
+        dup = np.flatnonzero(best == 0)
+        if len(dup):
+            share[dup] = _duplicate_share(delay_embedding_view(y, m, tau)[dup], nxt[dup])
 
-        nn = NearestNeighbors(n_neighbors=2).fit(X)
-        dists, idxs = nn.kneighbors(X)
+        tied = np.flatnonzero((best > 0) & (second == best))
+        for b in range(0, len(tied), FNN_TIE_BLOCK):
+            r = tied[b : b + FNN_TIE_BLOCK]
+            ii, jj = np.nonzero(sub[r] == best[r, None])
+            share[r] = _tie_share(nxt, r[ii], jj, best[r[ii]], rtol, L)[r]
 
-        nn_dist = dists[:, 1]
-        nn_idx = idxs[:, 1]
+        out[m - 1] = 100.0 * share.mean()
 
-        delta = np.abs(Xp[:, -1] - Xp[nn_idx, -1])
-        false = (delta / (nn_dist + 1e-12)) > rtol
-        out[m - 1] = 100.0 * false.mean()
+        if stop_below is not None and out[m - 1] < stop_below:
+            break
 
     return out
 
 
+def _fnn_tree(y, tau, m_max, rtol, stop_below):
+    """
+    FNN scan for one delay with a KD-tree per embedding dimension.
+    """
+    N = len(y)
+    out = np.full(m_max, np.nan)
+
+    for m in range(1, m_max + 1):
+        L = N - m * tau
+        if L <= 2:
+            break
+
+        X = np.ascontiguousarray(delay_embedding_view(y, m, tau)[:L])
+        k = min(L, FNN_TREE_CANDIDATES + 1)
+        _, cand = NearestNeighbors(n_neighbors=k).fit(X).kneighbors(X)
+
+        # exact squared distances, summed as in _fnn_dense, self excluded
+        rows = np.arange(L)
+        d2 = _embedded_d2(y, tau, m, rows[:, None], cand)
+        d2[cand == rows[:, None]] = np.inf
+        best = d2.min(axis=1)
+        tied = d2 == best[:, None]
+
+        # every candidate tied: more neighbours may share the distance
+        full = tied[:, -1]
+        ii, cc = np.nonzero(tied & ~full[:, None])
+        pi, pj = [ii], [cand[ii, cc]]
+        for i in np.flatnonzero(full & (best > 0)):
+            row = _embedded_d2(y, tau, m, i, rows)
+            row[i] = np.inf
+            jj = np.flatnonzero(row == best[i])
+            pi.append(np.full(len(jj), i))
+            pj.append(jj)
+
+        nxt = y[m * tau : m * tau + L]
+        i, j = np.concatenate(pi), np.concatenate(pj)
+        share = _tie_share(nxt, i, j, best[i], rtol, L)
+
+        dup = np.flatnonzero(best == 0)
+        if len(dup):
+            share[dup] = _duplicate_share(X[dup], nxt[dup])
+
+        out[m - 1] = 100.0 * share.mean()
+
+        if stop_below is not None and out[m - 1] < stop_below:
+            break
+
+    return out
+
+
+_SELECTION_MEMO: OrderedDict = OrderedDict()
+
+
 def select_embedding_params(
     y: np.ndarray,
     max_tau: int = 60,
     max_m: int = 12,
     fnn_threshold: float = 5.0,
     tau_cap: int | None = None,
+    cache: DiskCache | None = None,
+    memo: bool = True,
+    early_stop: bool = False,
 ) -> tuple[int, int, dict]:
     """
     Select (tau, m) using AMI + FNN.
+
+    info["fnn"] is the full FNN curve for m=1..max_m. With early_stop, the
+    FNN scan stops at the chosen m (same selection, less work) and the
+    later entries of info["fnn"] are NaN.
+
+    Results are memoized in-process (last SELECTION_MEMO_SIZE calls) and,
+    with cache (a DiskCache), on disk, keyed by the finite values and the
+    selection arguments.
     """
-    y = np.asarray(y)
+    y = np.asarray(y, dtype=float)
     y = y[np.isfinite(y)]
 
+    key = None
+    if memo or cache is not None:
+        key = hash_key(
+            y,
+            kind="embedding_params",
+            max_tau=max_tau,
+            max_m=max_m,
+            fnn_threshold=float(fnn_threshold),
+            tau_cap=tau_cap,
+            early_stop=early_stop,
+        )
+        hit = _SELECTION_MEMO.get(key) if memo else None
+        if hit is None and cache is not None:
+            hit = cache.get(key)
+            if hit is not None and memo:
+                _remember(key, hit)
+        elif hit is not None:
+            _SELECTION_MEMO.move_to_end(key)
+        if hit is not None:
+            return _unpack_selection(hit)
+
+    tau, m, info = _select_embedding_params(y, max_tau, max_m, fnn_threshold, tau_cap, early_stop)
+
+    if key is not None:
+        # copies: callers may modify the arrays returned in info
+        arrays = {
+            "ami": info["ami"].copy(),
+            "fnn": info["fnn"].copy(),
+            "tau": np.array(tau),
+            "m": np.array(m),
+        }
+        if memo:
+            _remember(key, arrays)
+        if cache is not None:
+            cache.put(key, arrays)
+
+    return tau, m, info
+
+
+def clear_selection_memo() -> None:
+    _SELECTION_MEMO.clear()
+
+
+def _remember(key: str, arrays: dict) -> None:
+    _SELECTION_MEMO[key] = arrays
+    while len(_SELECTION_MEMO) > SELECTION_MEMO_SIZE:
+        _SELECTION_MEMO.popitem(last=False)
+
+
+def _unpack_selection(arrays: dict) -> tuple[int, int, dict]:
+    tau = int(arrays["tau"])
+    m = int(arrays["m"])
+    info = {
+        "ami": np.array(arrays["ami"]),
+        "fnn": np.array(arrays["fnn"]),
+        "tau": tau,
+        "m": m,
+    }
+    return tau, m, info
+
+
+def _select_embedding_params(y, max_tau, max_m, fnn_threshold, tau_cap, early_stop=False):
     ami_vals = ami_tau(y, max_tau=max_tau)
     tau = first_local_minimum(ami_vals)
 
@@ -120,12 +416,9 @@ def select_embedding_params(
     if tau_cap is not None:
         tau = min(tau, tau_cap)
 
-    fnn_vals = fnn_percent(y, tau=tau, m_max=max_m)
-
-    try:
-        m = next(i + 1 for i, v in enumerate(fnn_vals) if v < fnn_threshold)
-    except StopIteration:
-        m = max_m
+    stop_below = fnn_threshold if early_stop else None
+    fnn_vals = fnn_percent(y, tau=tau, m_max=max_m, stop_below=stop_below)
+    m = _first_below(fnn_vals, fnn_threshold, max_m)
 
     info = {
         "ami": ami_vals,
@@ -135,3 +428,314 @@ def select_embedding_params(
     }
 
     return tau, m, info
+
+
+def _first_below(fnn_vals, fnn_threshold, max_m) -> int:
+    try:
+        return next(i + 1 for i, v in enumerate(fnn_vals) if v < fnn_threshold)
+    except StopIteration:
+        return max_m
+
+
+# ----------------------------
+# Rolling (time-varying) selection
+# ----------------------------
+def rolling_embedding_params(
+    series: pd.Series,
+    window: int,
+    stride: int = 1,
+    max_tau: int = 60,
+    max_m: int = 12,
+    fnn_threshold: float = 5.0,
+    tau_cap: int | None = None,
+    bins: int = 32,
+    rtol: float = 10.0,
+) -> pd.DataFrame:
+    """
+    select_embedding_params on every rolling window, updated incrementally.
+
+    AMI joint histograms use one set of bin edges for the whole series
+    (equal-width over its finite range), so sliding the window only moves
+    2 * max_tau pairs and MI is refreshed from running sum(n log n) terms.
+    FNN nearest neighbours are kept per embedding dimension at the current
+    tau: a slide drops the oldest point (re-searching only the points that
+    used it as neighbour) and adds the newest; a tau change rebuilds them.
+    Each window's FNN % equals fnn_percent on that window; its AMI equals
+    ami_tau(window, edges=series_edges).
+
+    Parameters
+    ----------
+    series : pd.Series
+        Time-indexed 1D series; non-finite values are dropped first
+    window, stride : int
+        Rolling window length and step (in samples)
+    max_tau : int
+        Largest AMI delay (capped at window - 2)
+    bins : int
+        Number of AMI histogram bins over the series range
+
+    Returns
+    -------
+    pd.DataFrame
+        Indexed by window end date, with start_date, tau, m and fnn (FNN %
+        at the chosen m). Can be passed to rolling_ph(schedule=...).
+    """
+    if not isinstance(series, pd.Series):
+        raise TypeError("series must be a pandas Series")
+
+    series = series.sort_index()
+    series = series[np.isfinite(series.to_numpy(dtype=float))]
+    y = series.to_numpy(dtype=float)
+    dates = series.index
+
+    if len(y) < window:
+        raise ValueError("Series shorter than rolling window")
+
+    max_tau = max(1, min(max_tau, window - 2))
+    _, edges = np.histogram(y, bins=bins)
+    ami = _RollingAMI(_bin_codes(y, edges), bins, max_tau, window)
+    fnn = _RollingFNN(y, window, rtol)
+
+    rows = []
+    for end in range(window, len(y) + 1, stride):
+        ami.move_to(end)
+        tau = first_local_minimum(ami.values())
+        if tau is None:
+            tau = max_tau // 5
+        if tau_cap is not None:
+            tau = min(tau, tau_cap)
+
+        fnn.move_to(end, tau)
+        m, pct = max_m, np.nan
+        for d in range(1, max_m + 1):
+            v = fnn.percent(d)
+            if np.isnan(v):
+                break
+            if v < fnn_threshold:
+                m, pct = d, v
+                break
+        else:
+            pct = fnn.percent(max_m)
+
+        rows.append(
+            {
+                "start_date": dates[end - window],
+                "end_date": dates[end - 1],
+                "tau": tau,
+                "m": m,
+                "fnn": pct,
+            }
+        )
+
+    return pd.DataFrame(rows).set_index("end_date")
+
+
+def _xlogx(n: np.ndarray) -> np.ndarray:
+    n = np.asarray(n, dtype=float)
+    return n * np.log(np.maximum(n, 1.0))
+
+
+class _RollingAMI:
+    """
+    Joint / marginal bin counts of (x[t], x[t + tau]), tau = 1..max_tau,
+    over a sliding window of coded samples.
+
+    MI = log N + (sum c log c - sum r log r - sum k log k) / N, with
+    N = window - tau pairs, joint counts c and marginals r, k.
+    """
+
+    def __init__(self, x: np.ndarray, bins: int, max_tau: int, window: int):
+        self.x = x.astype(np.int64)
+        self.bins = bins
+        self.window = window
+        self.taus = np.arange(1, max_tau + 1)
+        self.rows = np.arange(max_tau)
+        self.end = None
+
+    def _rebuild(self, end: int) -> None:
+        xw = self.x[end - self.window : end]
+        self.joint = _joint_counts(xw, len(self.taus), self.bins).astype(np.int64)
+        self.lead = self.joint.sum(axis=2)
+        self.lag = self.joint.sum(axis=1)
+        self.s_joint = _xlogx(self.joint).sum(axis=(1, 2))
+        self.s_lead = _xlogx(self.lead).sum(axis=1)
+        self.s_lag = _xlogx(self.lag).sum(axis=1)
+        self.end = end
+
+    def move_to(self, end: int) -> None:
+        if self.end is None or end - self.end >= self.window // 2:
+            self._rebuild(end)
+            return
+        while self.end < end:
+            self._slide()
+
+    def _slide(self) -> None:
+        x, taus = self.x, self.taus
+        s = self.end - self.window  # leaving sample
+        e = self.end  # entering sample
+
+        self._bump(x[s], x[s + taus], -1)
+        self._bump(x[e - taus], x[e], +1)
+        self.end += 1
+
+    def _bump(self, a, b, step: int) -> None:
+        rows = self.rows
+        a = np.broadcast_to(a, rows.shape)
+        b = np.broadcast_to(b, rows.shape)
+
+        old = self.joint[rows, a, b]
+        self.joint[rows, a, b] = old + step
+        self.s_joint += _xlogx(old + step) - _xlogx(old)
+
+        old = self.lead[rows, a]
+        self.lead[rows, a] = old + step
+        self.s_lead += _xlogx(old + step) - _xlogx(old)
+
+        old = self.lag[rows, b]
+        self.lag[rows, b] = old + step
+        self.s_lag += _xlogx(old + step) - _xlogx(old)
+
+    def values(self) -> np.ndarray:
+        n = (self.window - self.taus).astype(float)
+        return np.log(n) + (self.s_joint - self.s_lead - self.s_lag) / n
+
+
+class _RollingFNN:
+    """
+    Nearest neighbours of the delay vectors of a sliding window, per
+    embedding dimension m, at one tau.
+
+    At dimension m the window [s, e) holds points i in [s, e - m * tau)
+    (an (m+1)-th coordinate is needed). For each point the nearest
+    distance is kept with the number of neighbours at that distance and
+    how many of them are false, so ties are split as in fnn_scan.
+    """
+
+    def __init__(self, y: np.ndarray, window: int, rtol: float):
+        self.y = y
+        self.window = window
+        self.rtol = rtol
+        self.tau = None
+        self.end = None
+        self.dims: dict[int, dict] = {}
+
+    def move_to(self, end: int, tau: int) -> None:
+        if tau != self.tau:
+            self.dims.clear()
+            self.tau = tau
+        self.end = end
+
+    def percent(self, m: int) -> float:
+        lo = self.end - self.window
+        hi = self.end - m * self.tau
+        if hi - lo <= 2:
+            return np.nan
+
+        st = self.dims.get(m)
+        if st is None or st["hi"] > hi or 2 * (hi - st["hi"]) >= hi - lo:
+            st = self.dims[m] = self._build(m, lo, hi)
+        while st["hi"] < hi:
+            self._slide(m, st)
+
+        return 100.0 * st["share"][lo:hi].mean()
+
+    def _dist2(self, m: int, p: int, lo: int, hi: int) -> np.ndarray:
+        """
+        Squared distances from point p to points lo..hi-1 (dimension m).
+        """
+        y, tau = self.y, self.tau
+        d2 = (y[lo:hi] - y[p]) ** 2
+        for k in range(1, m):
+            d2 += (y[lo + k * tau : hi + k * tau] - y[p + k * tau]) ** 2
+        return d2
+
+    def _false(self, m: int, i: np.ndarray, j: np.ndarray, d2: np.ndarray) -> np.ndarray:
+        # a duplicate (d2 == 0) is false when its next value differs at all
+        y = self.y
+        off = m * self.tau
+        delta = np.abs(y[i + off] - y[j + off])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(d2 > 0, (delta / (np.sqrt(d2) + 1e-12)) > self.rtol, delta > 0)
+
+    def _share(self, st: dict, i: np.ndarray) -> None:
+        # the point itself is one of its zero-distance neighbours
+        st["share"][i] = st["n_false"][i] / (st["count"][i] + (st["d2"][i] == 0))
+
+    def _build(self, m: int, lo: int, hi: int) -> dict:
+        y, tau = self.y, self.tau
+        L = hi - lo
+
+        D2 = np.zeros((L, L))
+        for k in range(m):
+            c = y[lo + k * tau : hi + k * tau]
+            D2 += (c[:, None] - c[None, :]) ** 2
+        np.fill_diagonal(D2, np.inf)
+
+        best = D2.min(axis=1)
+        ii, jj = np.nonzero(D2 == best[:, None])
+        false = self._false(m, ii + lo, jj + lo, best[ii])
+
+        # nearest distance / tie count / false ties / share, by absolute position
+        st = {
+            "lo": lo,
+            "hi": hi,
+            "d2": np.full(len(y), np.inf),
+            "count": np.zeros(len(y), dtype=np.int64),
+            "n_false": np.zeros(len(y), dtype=np.int64),
+            "share": np.zeros(len(y)),
+        }
+        idx = np.arange(lo, hi)
+        st["d2"][lo:hi] = best
+        st["count"][lo:hi] = np.bincount(ii, minlength=L)
+        st["n_false"][lo:hi] = np.bincount(ii, weights=false, minlength=L).astype(np.int64)
+        self._share(st, idx)
+        return st
+
+    def _nearest(self, m: int, st: dict, i: int, lo: int, hi: int) -> None:
+        dist = self._dist2(m, i, lo, hi)
+        dist[i - lo] = np.inf
+        best = dist.min()
+        ties = lo + np.flatnonzero(dist == best)
+        st["d2"][i] = best
+        st["count"][i] = len(ties)
+        st["n_false"][i] = int(self._false(m, np.full(len(ties), i), ties, np.full(len(ties), best)).sum())
+
+    def _slide(self, m: int, st: dict) -> None:
+        lo, hi = st["lo"], st["hi"]
+        d2, count, n_false = st["d2"], st["count"], st["n_false"]
+
+        # drop point lo from the ties of the points that had it
+        dist = self._dist2(m, lo, lo + 1, hi)
+        lost = np.flatnonzero(dist == d2[lo + 1 : hi])
+        i = lo + 1 + lost
+        count[i] -= 1
+        n_false[i] -= self._false(m, i, np.full(len(i), lo), dist[lost])
+        lo += 1
+
+        # re-search the points left without a neighbour
+        orphans = i[count[i] == 0]
+        for o in orphans:
+            self._nearest(m, st, o, lo, hi)
+
+        # add point hi: a new nearest neighbour or one more tie
+        p = hi
+        dist = self._dist2(m, p, lo, hi)
+        cur = d2[lo:hi]
+        closer = np.flatnonzero(dist < cur)
+        tie = np.flatnonzero(dist == cur)
+        pf = self._false(m, np.arange(lo, hi), np.full(hi - lo, p), dist)
+
+        d2[lo + closer] = dist[closer]
+        count[lo + closer] = 1
+        n_false[lo + closer] = pf[closer]
+        count[lo + tie] += 1
+        n_false[lo + tie] += pf[tie]
+
+        best = dist.min()
+        ties = np.flatnonzero(dist == best)
+        d2[p], count[p], n_false[p] = best, len(ties), int(pf[ties].sum())
+        hi += 1
+
+        changed = np.concatenate([i, lo + closer, lo + tie, [p]]).astype(np.int64)
+        self._share(st, changed)
+        st["lo"], st["hi"] = lo, hi
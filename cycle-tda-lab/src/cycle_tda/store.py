@@ -0,0 +1,193 @@
+# src/cycle_tda/store.py
+
+"""
+Columnar feature store (Parquet, hive-partitioned).
+
+Each table (e.g. "structural_ph", "coherence") is a directory of Parquet
+files partitioned by asset / era / window. Reads push date-range and
+asset filters down to the partition and row-group level, load only the
+requested columns and memory-map the files. CSV stays the export format
+for Power BI.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+from .io import save_features
+
+PARTITION_COLS = ("asset", "era", "window")
+DATE_COL = "end_date"
+
+
+def _arrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.fs as pafs
+    except ImportError as exc:
+        raise ImportError("FeatureStore requires pyarrow (pip install pyarrow)") from exc
+    return pa, ds, pafs
+
+
+class FeatureStore:
+    """
+    Parquet-backed store of feature tables under one root directory.
+
+    Usage
+    -----
+    store = FeatureStore(PROJECT_ROOT / "data/store")
+    store.write(df_all, "structural_ph")
+    df = store.read(
+        "structural_ph",
+        columns=["z1", "z1_null"],
+        assets=["Gold (XAU)", "Silver"],
+        eras=["Full"],
+        start="1971-01-01",
+    )
+    store.export_csv("structural_ph", "data/processed/structural_ph_outputs.csv")
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def tables(self) -> list[str]:
+        return sorted(p.name for p in self.path.iterdir() if p.is_dir())
+
+    def write(
+        self,
+        df: pd.DataFrame,
+        name: str,
+        partition_cols: tuple[str, ...] = PARTITION_COLS,
+        date_col: str = DATE_COL,
+    ) -> None:
+        """
+        Write df as table `name`, replacing only the partitions it contains.
+
+        A named index (e.g. rolling_ph's end_date) is stored as a column.
+        Rows are sorted by date so row-group statistics prune date filters.
+        """
+        pa, ds, _ = _arrow()
+
+        if df.index.name is not None:
+            df = df.reset_index()
+
+        partition_cols = [c for c in partition_cols if c in df.columns]
+        if date_col in df.columns:
+            df = df.sort_values(partition_cols + [date_col], kind="stable")
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        ds.write_dataset(
+            table,
+            self.path / name,
+            format="parquet",
+            partitioning=partition_cols or None,
+            partitioning_flavor="hive" if partition_cols else None,
+            existing_data_behavior="delete_matching",
+            basename_template="part-{i}.parquet",
+        )
+
+    def read(
+        self,
+        name: str,
+        columns: list[str] | None = None,
+        assets: list[str] | None = None,
+        eras: list[str] | None = None,
+        windows: list[int] | None = None,
+        start=None,
+        end=None,
+        date_col: str = DATE_COL,
+        index: str | None = None,
+    ) -> pd.DataFrame:
+        """
+        Load (a slice of) table `name`.
+
+        Parameters
+        ----------
+        columns : list of str, optional
+            Value columns to load; date and partition columns are always
+            included
+        assets, eras, windows : list, optional
+            Partition filters
+        start, end : date-like, optional
+            Inclusive bounds on date_col
+        index : str, optional
+            Column to set as index (e.g. "end_date")
+        """
+        _, ds, pafs = _arrow()
+
+        dataset = self._dataset(name, ds, pafs)
+        names = dataset.schema.names
+
+        filt = None
+        for col, values in (("asset", assets), ("era", eras), ("window", windows)):
+            if values is not None and col in names:
+                filt = _and(filt, ds.field(col).isin(list(values)))
+        if start is not None:
+            filt = _and(filt, ds.field(date_col) >= pd.Timestamp(start))
+        if end is not None:
+            filt = _and(filt, ds.field(date_col) <= pd.Timestamp(end))
+
+        if columns is not None:
+            keep = [date_col, *PARTITION_COLS, *columns]
+            columns = [c for c in dict.fromkeys(keep) if c in names]
+
+        df = dataset.to_table(columns=columns, filter=filt).to_pandas()
+
+        # hive partitions come back as dictionary / categorical columns
+        for col in PARTITION_COLS:
+            if col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype(df[col].cat.categories.dtype)
+        if "window" in df.columns:
+            df["window"] = df["window"].astype("int64")
+
+        if index is not None:
+            df = df.set_index(index)
+
+        return df
+
+    def read_panel(
+        self,
+        name: str,
+        value: str,
+        assets: list[str] | None = None,
+        eras: list[str] | None = None,
+        date_col: str = DATE_COL,
+        **filters,
+    ) -> pd.DataFrame:
+        """
+        date x asset matrix of one value column (e.g. z1 for the CCI),
+        reading only that column for the requested assets.
+        """
+        df = self.read(name, columns=[value], assets=assets, eras=eras, date_col=date_col, **filters)
+        return (
+            df
+            .pivot_table(index=date_col, columns="asset", values=value, aggfunc="last")
+            .sort_index()
+        )
+
+    def export_csv(self, name: str, path: str | Path, index: str | None = DATE_COL, **filters) -> Path:
+        """
+        Write (a filtered slice of) table `name` to CSV for Power BI.
+        """
+        df = self.read(name, index=index, **filters)
+        save_features(df, path, index=index is not None)
+        return Path(path)
+
+    def _dataset(self, name, ds, pafs):
+        root = self.path / name
+        if not root.exists():
+            raise FileNotFoundError(f"No table '{name}' in {self.path}")
+
+        partitioning = ds.partitioning(flavor="hive")
+        return ds.dataset(
+            str(root),
+            format="parquet",
+            partitioning=partitioning,
+            filesystem=pafs.LocalFileSystem(use_mmap=True),
+        )
+
+
+def _and(a, b):
+    return b if a is None else a & b
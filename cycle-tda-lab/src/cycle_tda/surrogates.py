@@ -0,0 +1,288 @@
+# src/cycle_tda/surrogates.py
+
+"""
+Surrogate-data significance tests for rolling PH.
+
+The white-noise null of rolling_ph destroys autocorrelation, so any
+persistent series looks "structured". Surrogates keep more of the window:
+- "phase": phase-randomized (same power spectrum, Gaussianized values)
+- "iaaft": iterative amplitude-adjusted Fourier transform (same values
+  and, approximately, the same power spectrum)
+
+Surrogates of a chunk of windows are generated together with batched
+FFTs (windows x surrogates x samples), PH runs in worker tasks over
+chunks of windows, and each window's surrogate z1 / max_h1 can be kept
+in a DiskCache.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .cache import DiskCache, hash_key
+from .embeddings import delay_embedding_view
+from .parallel import chunked, resolve_n_jobs, run_tasks
+from .ph import cap_deaths, compute_diagrams
+from .rolling import _h1_metrics, rolling_ph
+
+SURROGATE_METHODS = ("phase", "iaaft")
+N_SURROGATES = 100
+IAAFT_MAX_ITER = 100
+SURROGATE_QUANTILE = 0.95
+SURROGATE_MAX_BYTES = 32 * 1024**2  # surrogates generated at once per task
+
+
+# ----------------------------
+# Batched generators
+# ----------------------------
+def phase_randomized(
+    windows: np.ndarray,
+    n_surrogates: int,
+    rngs: list[np.random.Generator],
+) -> np.ndarray:
+    """
+    Phase-randomized surrogates of each row of `windows` (k, n).
+
+    The DC term (and the Nyquist term for even n) keeps its phase, so
+    surrogates have the window's mean and power spectrum.
+
+    Returns
+    -------
+    np.ndarray
+        Shape (k, n_surrogates, n); one generator per window
+    """
+    windows = np.asarray(windows, dtype=float)
+    k, n = windows.shape
+    spec = np.fft.rfft(windows, axis=-1)[:, None, :]
+
+    phases = np.stack([rng.uniform(0.0, 2 * np.pi, size=(n_surrogates, spec.shape[-1])) for rng in rngs])
+    phases[..., 0] = 0.0
+    if n % 2 == 0:
+        phases[..., -1] = 0.0
+
+    return np.fft.irfft(spec * np.exp(1j * phases), n=n, axis=-1)
+
+
+def iaaft(
+    windows: np.ndarray,
+    n_surrogates: int,
+    rngs: list[np.random.Generator],
+    max_iter: int = IAAFT_MAX_ITER,
+) -> np.ndarray:
+    """
+    IAAFT surrogates of each row of `windows` (k, n).
+
+    Starting from random shuffles, all surrogates alternate between
+    imposing the window's Fourier amplitudes and its sorted values, until
+    no surrogate's rank order changes or max_iter is reached. The result
+    is a permutation of the window values.
+
+    Returns
+    -------
+    np.ndarray
+        Shape (k, n_surrogates, n); one generator per window
+    """
+    windows = np.asarray(windows, dtype=float)
+    k, n = windows.shape
+    amplitude = np.abs(np.fft.rfft(windows, axis=-1))[:, None, :]
+    sorted_vals = np.broadcast_to(np.sort(windows, axis=-1)[:, None, :], (k, n_surrogates, n))
+
+    s = np.stack([np.stack([rng.permutation(w) for _ in range(n_surrogates)]) for w, rng in zip(windows, rngs)])
+    ranks = np.argsort(np.argsort(s, axis=-1), axis=-1)
+
+    for _ in range(max_iter):
+        spec = np.fft.rfft(s, axis=-1)
+        s = np.fft.irfft(amplitude * np.exp(1j * np.angle(spec)), n=n, axis=-1)
+
+        new_ranks = np.argsort(np.argsort(s, axis=-1), axis=-1)
+        s = np.take_along_axis(sorted_vals, new_ranks, axis=-1)
+        if np.array_equal(new_ranks, ranks):
+            break
+        ranks = new_ranks
+
+    return s
+
+
+_GENERATORS = {"phase": phase_randomized, "iaaft": iaaft}
+
+
+# ----------------------------
+# Rolling test
+# ----------------------------
+def rolling_surrogate_test(
+    series: pd.Series,
+    window: int,
+    stride: int = 1,
+    m: int = 3,
+    tau: int = 1,
+    method: str = "iaaft",
+    n_surrogates: int = N_SURROGATES,
+    normalize: bool = True,
+    seed: int = 0,
+    executor: str = "serial",
+    n_jobs: int | None = None,
+    chunk_size: int | None = None,
+    cache: DiskCache | None = None,
+    max_iter: int = IAAFT_MAX_ITER,
+    n_perm: int | None = None,
+    thresh: float = np.inf,
+    observed: pd.DataFrame | None = None,
+) -> pd.DataFrame:
+    """
+    Per-window surrogate p-values for z1 and max_h1.
+
+    Parameters
+    ----------
+    method : {"phase", "iaaft"}
+        Surrogate generator
+    n_surrogates : int
+        Surrogates per window
+    seed : int
+        Window ending at position `end` draws from SeedSequence([seed,
+        end]), so results do not depend on the executor or chunking
+    cache : DiskCache | None
+        Stores each window's surrogate z1 / max_h1, keyed by the window
+        values and all settings above
+    observed : pd.DataFrame | None
+        rolling_ph output for the same (window, stride, m, tau, normalize,
+        n_perm, thresh); computed if not given
+
+    Returns
+    -------
+    pd.DataFrame
+        The observed rolling_ph frame plus, for z1 and max_h1,
+        *_surr_median, *_surr_q95 and one-sided *_surr_pvalue
+        ((1 + #surrogates >= observed) / (1 + n_surrogates)).
+    """
+    if not isinstance(series, pd.Series):
+        raise TypeError("series must be a pandas Series")
+    if method not in SURROGATE_METHODS:
+        raise ValueError(f"Unknown method '{method}', expected one of {SURROGATE_METHODS}")
+
+    series = series.sort_index()
+    values = np.asarray(series.values, dtype=float)
+
+    if observed is None:
+        observed = rolling_ph(
+            series,
+            window,
+            stride,
+            m,
+            tau,
+            normalize=normalize,
+            executor=executor,
+            n_jobs=n_jobs,
+            chunk_size=chunk_size,
+            n_perm=n_perm,
+            thresh=thresh,
+        )
+    out = observed.copy()
+    if len(out) == 0:
+        return out
+
+    # windows rolling_ph kept (finite, non-constant)
+    ends = series.index.get_indexer(out.index) + 1
+
+    n_workers = 1 if executor == "serial" else resolve_n_jobs(n_jobs)
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(ends) // (4 * n_workers)))
+
+    settings = dict(
+        window=window,
+        m=m,
+        tau=tau,
+        method=method,
+        n_surrogates=n_surrogates,
+        normalize=normalize,
+        seed=seed,
+        max_iter=max_iter,
+        n_perm=n_perm,
+        thresh=thresh,
+    )
+    tasks = []
+    for sl in chunked(list(ends), chunk_size):
+        lo, hi = sl[0] - window, sl[-1]
+        tasks.append((values[lo:hi], lo, np.asarray(sl), settings, cache))
+
+    results = run_tasks(_surrogate_chunk, tasks, executor=executor, n_jobs=n_jobs)
+    z1 = np.concatenate([r[0] for r in results])
+    max_h1 = np.concatenate([r[1] for r in results])
+    if cache is not None:
+        for r in results:
+            cache.merge_stats(r[2])
+
+    for metric, null in (("z1", z1), ("max_h1", max_h1)):
+        obs = out[metric].to_numpy(dtype=float)
+        out[f"{metric}_surr_median"] = np.median(null, axis=1)
+        out[f"{metric}_surr_q95"] = np.quantile(null, SURROGATE_QUANTILE, axis=1)
+        out[f"{metric}_surr_pvalue"] = (1.0 + (null >= obs[:, None]).sum(axis=1)) / (1.0 + n_surrogates)
+    out["n_surrogates"] = n_surrogates
+    out["surrogate_method"] = method
+
+    return out
+
+
+def _surrogate_chunk(
+    values: np.ndarray,
+    offset: int,
+    ends: np.ndarray,
+    settings: dict,
+    cache: DiskCache | None,
+) -> tuple[np.ndarray, np.ndarray, dict]:
+    """
+    Surrogate z1 / max_h1 (len(ends), n_surrogates) for a chunk of windows.
+    """
+    window, m, tau = settings["window"], settings["m"], settings["tau"]
+    n_surr = settings["n_surrogates"]
+    approx = dict(n_perm=settings["n_perm"], thresh=settings["thresh"])
+    iter_opts = {"max_iter": settings["max_iter"]} if settings["method"] == "iaaft" else {}
+
+    if cache is not None:
+        cache = cache.fork()
+
+    z1 = np.empty((len(ends), n_surr))
+    max_h1 = np.empty((len(ends), n_surr))
+
+    # ----------------------------
+    # Cached windows
+    # ----------------------------
+    windows = np.stack([values[e - offset - window : e - offset] for e in ends])
+    keys = [None] * len(ends)
+    todo = []
+    for i, yw in enumerate(windows):
+        if cache is not None:
+            keys[i] = hash_key(yw, kind="surrogates", **settings)
+            hit = cache.get(keys[i])
+            if hit is not None:
+                z1[i], max_h1[i] = hit["z1"], hit["max_h1"]
+                continue
+        todo.append(i)
+
+    if not todo:
+        return z1, max_h1, cache.counters()
+
+    # ----------------------------
+    # Batched surrogates + PH
+    # ----------------------------
+    todo = np.asarray(todo)
+    batch = max(1, SURROGATE_MAX_BYTES // (8 * n_surr * window))
+    for b0 in range(0, len(todo), batch):
+        idx = todo[b0 : b0 + batch]
+        yw = windows[idx]
+        if settings["normalize"]:
+            yw = (yw - yw.mean(axis=1, keepdims=True)) / yw.std(axis=1, keepdims=True)
+
+        rngs = [np.random.default_rng(np.random.SeedSequence([settings["seed"], int(ends[i])])) for i in idx]
+        surr = _GENERATORS[settings["method"]](yw, n_surr, rngs, **iter_opts)
+        if settings["normalize"]:
+            surr = (surr - surr.mean(axis=-1, keepdims=True)) / surr.std(axis=-1, keepdims=True)
+
+        for j, i in enumerate(idx):
+            for k in range(n_surr):
+                X = delay_embedding_view(surr[j, k], m=m, tau=tau)
+                row = _h1_metrics(cap_deaths(compute_diagrams(X, maxdim=1, **approx)[1], approx["thresh"]))
+                z1[i, k], max_h1[i, k] = row["z1"], row["max_h1"]
+
+            if cache is not None:
+                cache.put(keys[i], {"z1": z1[i], "max_h1": max_h1[i]})
+
+    return z1, max_h1, ({} if cache is None else cache.counters())
@@ -0,0 +1,225 @@
+# src/cycle_tda/universe.py
+
+"""
+Multi-asset rolling PH scan (the notebook 05 loop, headless).
+
+For every asset: load, transform, select (tau, m) on the full history,
+then run rolling_ph over each era. Asset x era x representation jobs are
+spread over a worker pool, longest first, and reported as they finish.
+"""
+
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .io import load_series_auto, load_series_cached
+from .metrics import forecast_eligibility
+from .parallel import iter_tasks, run_tasks
+from .rolling import rolling_ph
+from .selection import select_embedding_params
+from .transforms import log_returns
+
+ERAS = {
+    "Full": None,
+    "Post-1971": "1971-01-01",
+}
+
+
+def _log_if_positive(series: pd.Series) -> pd.Series:
+    # log only when valid
+    return series if (series <= 0).any() else np.log(series)
+
+
+REPRESENTATIONS = {
+    "log": _log_if_positive,
+    "level": lambda s: s,
+    "log_returns": lambda s: log_returns(s).dropna(),
+}
+
+
+def scan_universe(
+    assets: dict,
+    data_dir: str | Path | None = None,
+    eras: dict | None = None,
+    representations: tuple[str, ...] = ("log",),
+    base_window: int = 60,
+    stride: int = 1,
+    max_tau: int = 60,
+    max_m: int = 12,
+    fnn_threshold: float = 5.0,
+    tau_cap_frac: int = 10,
+    min_points: int = 20,
+    min_length: int = 200,
+    executor: str = "process",
+    n_jobs: int | None = None,
+    on_event=None,
+    series_cache: str | Path | None = None,
+    **ph_kwargs,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Rolling PH for a universe of assets and eras.
+
+    Parameters
+    ----------
+    assets : dict
+        name -> CSV filename (relative to data_dir) or pd.Series
+    eras : dict, optional
+        era name -> start date (None = full history). Defaults to ERAS.
+    representations : tuple of str
+        Keys of REPRESENTATIONS applied to each raw series
+    executor, n_jobs
+        Worker pool for parameter selection and PH jobs; each job runs
+        rolling_ph serially inside its worker
+    on_event : callable, optional
+        Called with a dict (asset, era, status, seconds, ...) per job as
+        it finishes
+    series_cache : path, optional
+        Directory for the binary raw-series cache (see load_series_cached);
+        CSVs are re-parsed on every call if omitted
+    **ph_kwargs
+        Passed to rolling_ph (include_null, cache, n_perm, ...)
+
+    Returns
+    -------
+    df_all : pd.DataFrame
+        rolling_ph output with forecast_state, asset, era and window
+        columns (and representation, if more than one), in asset / era
+        order — the structural_ph_outputs table
+    log_df : pd.DataFrame
+        One row per job (or per asset, if it was skipped)
+    """
+    eras = ERAS if eras is None else eras
+    data_dir = Path(data_dir) if data_dir is not None else None
+    for rep in representations:
+        if rep not in REPRESENTATIONS:
+            raise ValueError(f"Unknown representation '{rep}', expected one of {list(REPRESENTATIONS)}")
+
+    log_rows = []
+
+    def emit(row):
+        log_rows.append(row)
+        if on_event is not None:
+            on_event(row)
+
+    # ----------------------------
+    # Load + transform
+    # ----------------------------
+    inputs = []  # (asset, rep, series)
+    for asset, source in assets.items():
+        if isinstance(source, pd.Series):
+            raw = source.sort_index().dropna()
+        else:
+            path = Path(source) if data_dir is None else data_dir / source
+            if not path.exists():
+                emit({"asset": asset, "status": "missing"})
+                continue
+            if series_cache is not None:
+                raw = load_series_cached(path, "auto", cache_dir=series_cache)
+            else:
+                raw = load_series_auto(path)
+
+        for rep in representations:
+            series = REPRESENTATIONS[rep](raw)
+            if len(series) < min_length:
+                emit({"asset": asset, "representation": rep, "status": "too_short"})
+                continue
+            inputs.append((asset, rep, series))
+
+    # ----------------------------
+    # Stage 1: embedding parameters
+    # ----------------------------
+    tau_cap = max(1, base_window // tau_cap_frac)
+    selected = run_tasks(
+        _select_params,
+        [(s.values, max_tau, max_m, fnn_threshold, tau_cap) for _, _, s in inputs],
+        executor=executor,
+        n_jobs=n_jobs,
+    )
+
+    jobs = []  # (asset, rep, era, series, window, m, tau)
+    for (asset, rep, series), (tau, m) in zip(inputs, selected):
+        window = max(base_window, (m - 1) * tau + 1)
+        points = window - (m - 1) * tau
+
+        if points < min_points:
+            emit({"asset": asset, "representation": rep, "status": "embedding_failed"})
+            continue
+
+        for era, start in eras.items():
+            s = series if start is None else series[series.index >= start]
+            if start is not None and len(s) < window + 5:
+                continue
+            jobs.append((asset, rep, era, s, window, m, tau))
+
+    # ----------------------------
+    # Stage 2: rolling PH, longest first
+    # ----------------------------
+    # ripser cost grows ~quadratically in the point count per window
+    cost = [
+        max(0, (len(s) - window) // stride + 1) * (window - (m - 1) * tau) ** 2
+        for _, _, _, s, window, m, tau in jobs
+    ]
+    order = sorted(range(len(jobs)), key=lambda i: -cost[i])
+    tasks = [(jobs[i][3], jobs[i][4], stride, jobs[i][5], jobs[i][6], ph_kwargs) for i in order]
+
+    frames = {}
+    for k, result in iter_tasks(_run_job, tasks, executor=executor, n_jobs=n_jobs):
+        asset, rep, era, _, window, m, tau = jobs[order[k]]
+        event = {
+            "asset": asset,
+            "representation": rep,
+            "era": era,
+            "window": window,
+            "m": m,
+            "tau": tau,
+        }
+
+        if isinstance(result, Exception):
+            emit({**event, "status": "failed", "error": repr(result)})
+            continue
+
+        df, seconds = result
+        frames[order[k]] = df
+        emit({**event, "status": "ok", "n_windows": len(df), "seconds": seconds})
+
+    # ----------------------------
+    # Assemble in job order
+    # ----------------------------
+    results = []
+    for i in sorted(frames):
+        asset, rep, era, _, window, _, _ = jobs[i]
+        df = frames[i]
+        df["forecast_state"] = forecast_eligibility(df["z1"])
+        df["asset"] = asset
+        df["era"] = era
+        df["window"] = window
+        if len(representations) > 1:
+            df["representation"] = rep
+        results.append(df)
+
+    df_all = pd.concat(results) if results else pd.DataFrame()
+    log_df = pd.DataFrame(log_rows)
+    if len(representations) == 1 and "representation" in log_df:
+        log_df = log_df.drop(columns="representation")
+
+    return df_all, log_df
+
+
+def _select_params(y, max_tau, max_m, fnn_threshold, tau_cap) -> tuple[int, int]:
+    tau, m, _ = select_embedding_params(
+        y,
+        max_tau=max_tau,
+        max_m=max_m,
+        fnn_threshold=fnn_threshold,
+        tau_cap=tau_cap,
+        early_stop=True,
+    )
+    return tau, m
+
+
+def _run_job(series, window, stride, m, tau, ph_kwargs) -> tuple[pd.DataFrame, float]:
+    t0 = time.perf_counter()
+    df = rolling_ph(series, window, stride, m, tau, **ph_kwargs)
+    return df, time.perf_counter() - t0
@@ -1,9 +1,16 @@
 import numpy as np
 
 
-def white_noise_like(y: np.ndarray, seed: int | None = None) -> np.ndarray:
+def white_noise_like(y: np.ndarray, seed=None) -> np.ndarray:
     """
     Generate white noise with same length and variance as y.
     """
+    return white_noise(len(y), scale=np.std(y), seed=seed)
+
+
+def white_noise(n: int, scale: float = 1.0, seed=None) -> np.ndarray:
+    """
+    Generate n samples of Gaussian white noise with standard deviation `scale`.
+    """
     rng = np.random.default_rng(seed)
-    return rng.normal(loc=0.0, scale=np.std(y), size=len(y))
+    return rng.normal(loc=0.0, scale=scale, size=n)
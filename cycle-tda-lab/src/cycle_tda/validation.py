@@ -0,0 +1,294 @@
+# src/cycle_tda/validation.py
+
+"""
+Lead-lag validation of PH signals (e.g. the CCI) against outcomes (e.g.
+S&P 500 drawdowns).
+
+corr at lag L pairs signal[t] with outcome[t - L] (the notebook 06
+convention: L > 0 is labelled "CCI leads by L m"), over the dates where
+both are present, exactly as Series.corr on shifted series.
+
+All lags of all signal/outcome pairs come from six FFT cross-correlations
+of the masked series (pair counts, sums, sums of squares and products).
+Moving-block bootstrap draws resample the pair index t in blocks; a draw
+is a vector of integer weights on t, so each draw is again six weighted
+cross-correlations and all lags are resampled consistently.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .parallel import chunked, run_tasks
+
+MAX_LAG = 36  # months
+NOTEBOOK_LAGS = (-6, -3, -1, 0, 1, 3, 6)
+N_BOOT = 1000
+BLOCK_LENGTH = 12  # months
+ALPHA = 0.05
+BOOT_BATCH = 50  # bootstrap draws per task
+VALIDATION_COLUMNS = ["lag_months", "correlation", "label"]
+
+
+def lag_label(lag: int, signal: str = "CCI") -> str:
+    if lag > 0:
+        return f"{signal} leads by {lag}m"
+    if lag < 0:
+        return f"{signal} lags by {abs(lag)}m"
+    return "Contemporaneous"
+
+
+# ----------------------------
+# Point estimates
+# ----------------------------
+def lagged_correlations(
+    signals: pd.Series | pd.DataFrame,
+    outcomes: pd.Series | pd.DataFrame,
+    max_lag: int = MAX_LAG,
+) -> pd.DataFrame:
+    """
+    Pearson correlation of every signal with every outcome at lags
+    -max_lag..max_lag, on their common dates.
+
+    Returns
+    -------
+    pd.DataFrame
+        Long format: signal, outcome, lag_months, correlation, n_obs
+    """
+    x, mx, y, my, names = _prepare(signals, outcomes)
+    nfft = _fft_length(len(x), max_lag)
+    lags = np.arange(-max_lag, max_lag + 1)
+
+    left = _spectra(_left_terms(x, mx), nfft)
+    right = _spectra(_right_terms(y, my), nfft)
+    r, n = _correlations(left, right, lags, nfft)
+
+    return _long_frame(r[0], n[0], lags, names)
+
+
+def bootstrap_lagged_correlations(
+    signals: pd.Series | pd.DataFrame,
+    outcomes: pd.Series | pd.DataFrame,
+    max_lag: int = MAX_LAG,
+    n_boot: int = N_BOOT,
+    block_length: int = BLOCK_LENGTH,
+    alpha: float = ALPHA,
+    seed: int = 0,
+    executor: str = "serial",
+    n_jobs: int | None = None,
+    batch_size: int = BOOT_BATCH,
+) -> pd.DataFrame:
+    """
+    lagged_correlations plus moving-block bootstrap percentile intervals.
+
+    Draw b uses np.random.SeedSequence([seed, b]), so results do not
+    depend on the executor, n_jobs or batch_size.
+
+    Returns
+    -------
+    pd.DataFrame
+        lagged_correlations columns plus ci_low, ci_high (alpha/2 and
+        1 - alpha/2 percentiles) and boot_se (bootstrap std)
+    """
+    if block_length < 1:
+        raise ValueError("block_length must be >= 1")
+
+    x, mx, y, my, names = _prepare(signals, outcomes)
+    T = len(x)
+    nfft = _fft_length(T, max_lag)
+    lags = np.arange(-max_lag, max_lag + 1)
+
+    left = _left_terms(x, mx)
+    right = _spectra(_right_terms(y, my), nfft)
+
+    r, n = _correlations(_spectra(left, nfft), right, lags, nfft)
+    out = _long_frame(r[0], n[0], lags, names)
+
+    tasks = [
+        (left, right, lags, nfft, min(block_length, T), seed, draws)
+        for draws in chunked(list(range(n_boot)), batch_size)
+    ]
+    boot = np.concatenate(run_tasks(_bootstrap_batch, tasks, executor=executor, n_jobs=n_jobs))
+
+    # (n_boot, lags, p, q) -> rows in _long_frame order
+    boot = boot.transpose(0, 2, 3, 1).reshape(n_boot, -1)
+    with np.errstate(invalid="ignore"):
+        out["ci_low"] = np.nanquantile(boot, alpha / 2, axis=0)
+        out["ci_high"] = np.nanquantile(boot, 1 - alpha / 2, axis=0)
+        out["boot_se"] = np.nanstd(boot, axis=0)
+    return out
+
+
+def _bootstrap_batch(left, right, lags, nfft, block_length, seed, draws) -> np.ndarray:
+    T = left.shape[1]
+    w = np.stack(
+        [
+            block_weights(T, block_length, np.random.default_rng(np.random.SeedSequence([seed, b])))
+            for b in draws
+        ]
+    )
+    spectra = _spectra(w[:, None, :, None] * left[None], nfft)
+    r, _ = _correlations(spectra, right, lags, nfft)
+    return r
+
+
+def block_weights(T: int, block_length: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    How often each of T positions appears in one moving-block bootstrap
+    sample: ceil(T / block_length) blocks with uniform starts, the last
+    one cut so the sample has length T.
+    """
+    k = -(-T // block_length)
+    starts = rng.integers(0, T - block_length + 1, size=k)
+    lengths = np.full(k, block_length)
+    lengths[-1] = T - (k - 1) * block_length
+
+    delta = np.zeros(T + 1, dtype=np.int64)
+    np.add.at(delta, starts, 1)
+    np.add.at(delta, starts + lengths, -1)
+    return np.cumsum(delta[:-1]).astype(float)
+
+
+# ----------------------------
+# FFT sums
+# ----------------------------
+def _prepare(signals, outcomes):
+    """
+    Align on common dates; centre each column on its observed mean and
+    zero-fill gaps (masks mark observed values).
+    """
+    X = signals.to_frame() if isinstance(signals, pd.Series) else signals
+    Y = outcomes.to_frame() if isinstance(outcomes, pd.Series) else outcomes
+    common = X.index.intersection(Y.index)
+    X = X.loc[common].sort_index().to_numpy(dtype=float)
+    Y = Y.loc[common].sort_index().to_numpy(dtype=float)
+
+    def centred(a):
+        mask = np.isfinite(a)
+        mean = np.nanmean(np.where(mask, a, np.nan), axis=0) if len(a) else 0.0
+        return np.where(mask, a - mean, 0.0), mask.astype(float)
+
+    x, mx = centred(X)
+    y, my = centred(Y)
+    names = (_names(signals), _names(outcomes))
+    return x, mx, y, my, names
+
+
+def _names(obj) -> list:
+    if isinstance(obj, pd.Series):
+        return [obj.name]
+    return list(obj.columns)
+
+
+def _fft_length(T: int, max_lag: int) -> int:
+    n = T + max_lag + 1
+    return 1 << (n - 1).bit_length()
+
+
+def _left_terms(x, mx) -> np.ndarray:
+    return np.stack([mx, x, x * x])  # (3, T, p)
+
+
+def _right_terms(y, my) -> np.ndarray:
+    return np.stack([my, y, y * y])  # (3, T, q)
+
+
+def _spectra(a: np.ndarray, nfft: int) -> np.ndarray:
+    return np.fft.rfft(a, n=nfft, axis=-2)
+
+
+# (left term, right term) for n, Sx, Sy, Sxx, Syy, Sxy
+_SUM_TERMS = ((0, 0), (1, 0), (0, 1), (2, 0), (0, 2), (1, 1))
+
+
+def _correlations(left, right, lags, nfft):
+    """
+    Pearson r and pair counts at `lags` from left spectra (..., 3, F, p)
+    and right spectra (3, F, q).
+
+    sum_t a[t] * b[t - lag] is irfft(A * conj(B)) at index lag mod nfft.
+    """
+    left = left.reshape((-1,) + left.shape[-3:])
+    rb = np.conj(right)
+
+    sums = []
+    for i, j in _SUM_TERMS:
+        prod = left[:, i, :, :, None] * rb[j][None, :, None, :]
+        c = np.fft.irfft(prod, n=nfft, axis=1)
+        sums.append(c[:, lags % nfft])
+    n, sx, sy, sxx, syy, sxy = sums
+
+    n = np.rint(n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = n * sxy - sx * sy
+        vx = n * sxx - sx * sx
+        vy = n * syy - sy * sy
+        r = cov / np.sqrt(vx * vy)
+
+    scale = np.maximum(np.abs(n * sxx), np.abs(n * syy))
+    bad = (n < 2) | (vx <= 1e-12 * scale) | (vy <= 1e-12 * scale)
+    r = np.where(bad, np.nan, np.clip(r, -1.0, 1.0))
+    return r, n.astype(np.int64)
+
+
+def _long_frame(r, n, lags, names) -> pd.DataFrame:
+    """
+    (lags, p, q) arrays -> one row per (signal, outcome, lag).
+    """
+    sig, out = names
+    p, q = len(sig), len(out)
+    return pd.DataFrame(
+        {
+            "signal": np.repeat(np.asarray(sig, dtype=object), q * len(lags)),
+            "outcome": np.tile(np.repeat(np.asarray(out, dtype=object), len(lags)), p),
+            "lag_months": np.tile(lags, p * q),
+            "correlation": r.transpose(1, 2, 0).ravel(),
+            "n_obs": n.transpose(1, 2, 0).ravel(),
+        }
+    )
+
+
+# ----------------------------
+# Export
+# ----------------------------
+def validation_table(
+    df: pd.DataFrame,
+    signal=None,
+    outcome=None,
+    lags: list[int] | None = None,
+    label: str = "CCI",
+    decimals: int = 4,
+) -> pd.DataFrame:
+    """
+    One signal/outcome pair in the validation_correlations.csv schema
+    (lag_months, correlation, label), followed by ci_low / ci_high when
+    present. Defaults to the first pair and all lags.
+    """
+    signal = df["signal"].iloc[0] if signal is None else signal
+    outcome = df["outcome"].iloc[0] if outcome is None else outcome
+    sel = df[(df["signal"] == signal) & (df["outcome"] == outcome)]
+    if lags is not None:
+        sel = sel[sel["lag_months"].isin(lags)]
+
+    table = pd.DataFrame(
+        {
+            "lag_months": sel["lag_months"].to_numpy(),
+            "correlation": sel["correlation"].round(decimals).to_numpy(),
+            "label": [lag_label(int(lag), label) for lag in sel["lag_months"]],
+        }
+    )
+    for col in ("ci_low", "ci_high"):
+        if col in sel.columns:
+            table[col] = sel[col].round(decimals).to_numpy()
+    return table
+
+
+def export_validation_correlations(table: pd.DataFrame, path: str | Path) -> Path:
+    """
+    Write a validation_table to CSV (no index), as notebook 06 does.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table.to_csv(path, index=False)
+    return path
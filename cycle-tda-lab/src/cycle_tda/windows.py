@@ -0,0 +1,111 @@
+# src/cycle_tda/windows.py
+
+import numpy as np
+
+CANCELLATION_GUARD = 1e8  # exact recompute below ~8 reliable digits of variance
+
+
+def window_prefix(values: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Running sums behind rolling_window_stats; reusable across window sizes.
+    """
+    values = np.asarray(values, dtype=float)
+    ok = np.isfinite(values)
+
+    # Shift by the global mean so the running sums stay well conditioned.
+    shift = values[ok].mean() if ok.any() else 0.0
+    v = np.where(ok, values - shift, 0.0)
+
+    return {
+        "shift": shift,
+        "n_bad": np.concatenate([[0], np.cumsum(~ok)]),
+        "s1": np.concatenate([[0.0], np.cumsum(v)]),
+        "s2": np.concatenate([[0.0], np.cumsum(v * v)]),
+    }
+
+
+def rolling_window_stats(
+    values: np.ndarray,
+    window: int,
+    ends: np.ndarray,
+    prefix: dict[str, np.ndarray] | None = None,
+) -> dict[str, np.ndarray]:
+    """
+    Per-window finiteness, mean, std (ddof=0) and range in O(n).
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Full 1D series (may contain NaN)
+    window : int
+        Window length (in samples)
+    ends : np.ndarray
+        Exclusive window end positions into `values`
+    prefix : dict, optional
+        window_prefix(values), when stats for several windows are needed
+
+    Returns
+    -------
+    dict
+        finite, mean, std, range arrays aligned with `ends`.
+        mean/std/range are only meaningful where finite is True.
+    """
+    values = np.asarray(values, dtype=float)
+    ends = np.asarray(ends, dtype=np.int64)
+    starts = ends - window
+
+    if prefix is None:
+        prefix = window_prefix(values)
+    shift, n_bad, s1, s2 = prefix["shift"], prefix["n_bad"], prefix["s1"], prefix["s2"]
+
+    finite = (n_bad[ends] - n_bad[starts]) == 0
+
+    m1 = (s1[ends] - s1[starts]) / window
+    m2 = (s2[ends] - s2[starts]) / window
+
+    mean = m1 + shift
+    var = m2 - m1 * m1
+
+    # Running sums carry an absolute error ~ eps * s2[-1]. Where that could
+    # swamp the window variance (near-constant windows), recompute exactly.
+    tol = CANCELLATION_GUARD * np.finfo(float).eps * s2[-1] / window
+    for i in np.flatnonzero(finite & (var <= tol)):
+        yw = values[starts[i] : ends[i]]
+        mean[i] = yw.mean()
+        var[i] = yw.var()
+
+    std = np.sqrt(np.maximum(var, 0.0))
+
+    # max - min, with min(x) = -max(-x)
+    rng = sliding_max(values, window) + sliding_max(-values, window)
+
+    return {
+        "finite": finite,
+        "mean": mean,
+        "std": std,
+        "range": rng[starts],
+    }
+
+
+def sliding_max(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Maximum over every length-`window` slice of x (van Herk / Gil-Werman).
+
+    Returns an array of length len(x) - window + 1; element i covers
+    x[i : i + window]. O(n) regardless of window size.
+    """
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    if window < 1 or window > n:
+        raise ValueError("window must be in [1, len(x)]")
+
+    n_blocks = -(-n // window)
+    padded = np.full(n_blocks * window, -np.inf)
+    padded[:n] = x
+    blocks = padded.reshape(n_blocks, window)
+
+    prefix = np.maximum.accumulate(blocks, axis=1).ravel()
+    suffix = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+
+    i = np.arange(n - window + 1)
+    return np.maximum(suffix[i], prefix[i + window - 1])